@@ -1,11 +1,19 @@
+import bisect
+import heapq
+import itertools
 import sys
+import time
+from array import array
+from collections import deque
 
-# La classe non tiene conto del Path Cost perché lo estrarremo una volta trovato il goal
+# Il Path Cost serve solo ad A*: per gli altri algoritmi resta 0
+# e il percorso viene estratto una volta trovato il goal
 class Node():
-    def __init__(self, state, parent, action):
+    def __init__(self, state, parent, action, cost=0):
         self.state = state
         self.parent = parent
         self.action = action
+        self.cost = cost
 
 
 
@@ -50,100 +58,602 @@ class QueueFrontier(StackFrontier):
             return node
 
 
-# Prende in input un file .txt e cerca di risolverlo
+# Come StackFrontier, ma con add/remove/contains_state in O(1):
+# i nodi stanno in una deque e un dizionario stato -> nodo ne rispecchia il contenuto
+# (si assume, come fa solve, al massimo un nodo per stato nella frontiera).
+# Copia identica di Projects/degrees/util.py: lo script della lezione resta
+# autonomo e non importa dal progetto, quindi ogni modifica va fatta in entrambi
+class IndexedStackFrontier():
+
+    def __init__(self):
+        self.frontier = deque()
+        self.states = {}
+
+    def add(self, node):
+        self.frontier.append(node)
+        self.states[node.state] = node
+
+    def contains_state(self, state):
+        return state in self.states
+
+    def empty(self):
+        return len(self.frontier) == 0
+
+    def __len__(self):
+        return len(self.frontier)
+
+    def _pop(self):
+        return self.frontier.pop()
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        else:
+            node = self._pop()
+            if self.states.get(node.state) is node:
+                del self.states[node.state]
+            return node
+
+
+# Versione FIFO: estrae dalla testa della deque
+class IndexedQueueFrontier(IndexedStackFrontier):
+
+    def _pop(self):
+        return self.frontier.popleft()
+
+
+# Frontiera a priorità basata su heap: remove estrae il nodo con priorità minore
+# (a parità, quello inserito per primo). Aggiungere uno stato già presente con
+# priorità migliore fa da decrease-key: la vecchia voce viene invalidata e
+# scartata quando arriva in cima allo heap
+class PriorityFrontier():
+
+    def __init__(self, priority):
+        self.priority = priority
+        self.heap = []
+        self.entries = {}
+        self.counter = itertools.count()
+
+    def add(self, node):
+        priority = self.priority(node)
+        entry = self.entries.get(node.state)
+        if entry is not None:
+            if entry[0] <= priority:
+                return
+            entry[2] = None
+        entry = [priority, next(self.counter), node]
+        self.entries[node.state] = entry
+        heapq.heappush(self.heap, entry)
+
+    def contains_state(self, state):
+        return state in self.entries
+
+    def empty(self):
+        return len(self.entries) == 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        while True:
+            _, _, node = heapq.heappop(self.heap)
+            if node is not None:
+                del self.entries[node.state]
+                return node
+
+
+# Strumentazione opzionale del ciclo di ricerca: solve la aggiorna solo se
+# gliene viene passata una, altrimenti non costa nulla.
+# on_expand, se presente, viene chiamata con ogni stato espanso.
+# Anche questa è una copia identica di quella in Projects/degrees/util.py,
+# da tenere allineata
+class SearchStats():
+
+    def __init__(self, on_expand=None):
+        self.expanded = 0
+        self.frontier_max = 0
+        self.neighbor_seconds = 0.0
+        self.membership_seconds = 0.0
+        self.on_expand = on_expand
+
+    def expand(self, state, frontier_size):
+        self.expanded += 1
+        if frontier_size > self.frontier_max:
+            self.frontier_max = frontier_size
+        if self.on_expand is not None:
+            self.on_expand(state)
+
+    def __str__(self):
+        return (f"expanded {self.expanded}, frontier max {self.frontier_max}, "
+                f"neighbors {self.neighbor_seconds:.4f}s, "
+                f"membership {self.membership_seconds:.4f}s")
+
+
+MODES = ["dfs", "bfs", "greedy", "astar", "wavefront", "jps"]
+
+# Direzioni di movimento come (azione, delta riga, delta colonna)
+DIRECTIONS = [("up", -1, 0), ("down", 1, 0), ("left", 0, -1), ("right", 0, 1)]
+
+
+# Prende in input un file .txt e cerca di risolverlo.
+# La griglia è un bytearray "piatto": la cella (i, j) sta all'indice
+# i * width + j e vale 1 se è un muro, così anche labirinti enormi non
+# creano un oggetto Python per cella
 class Maze():
 
     def __init__(self, filename):
 
-        # Read file and set height and width of maze
-        with open(filename) as f:
-            contents = f.read()
+        # Spaces, A and B are open cells, every other character is a wall
+        table = bytearray(b"\x01" * 256)
+        for open_cell in b" AB":
+            table[open_cell] = 0
+
+        # Stream the file line by line straight into the packed grid,
+        # locating A and B on the way. Rows shorter than the widest one
+        # are padded with open cells, as before. Rows are stored stride
+        # bytes apart; when a longer line arrives the stride at least
+        # doubles, so lines that keep getting longer cost O(log width)
+        # re-layouts rather than one each
+        self.walls = bytearray()
+        self.height = 0
+        self.width = 0
+        stride = 0
+        starts = goals = 0
+        with open(filename, "rb") as f:
+            for line in f:
+                line = line.rstrip(b"\r\n")
+
+                # Any non-ASCII character is a single wall cell
+                if not line.isascii():
+                    line = line.decode("utf-8").encode("ascii", "replace")
+
+                if len(line) > self.width:
+                    self.width = len(line)
+                    if self.width > stride:
+                        stride = self.relayout(stride, max(self.width, 2 * stride))
+
+                if b"A" in line:
+                    starts += line.count(b"A")
+                    self.start = (self.height, line.index(b"A"))
+                if b"B" in line:
+                    goals += line.count(b"B")
+                    self.goal = (self.height, line.index(b"B"))
+
+                self.walls += line.translate(table)
+                self.walls += bytes(stride - len(line))
+                self.height += 1
+
+        # Trim the spare columns left by the last growth, if any
+        if stride != self.width:
+            self.relayout(stride, self.width)
 
         # Validate start and goal
-        if contents.count("A") != 1:
+        if starts != 1:
             raise Exception("maze must have exactly one start point")
-        if contents.count("B") != 1:
+        if goals != 1:
             raise Exception("maze must have exactly one goal")
 
-        # Determine height and width of maze
-        contents = contents.splitlines()
-        self.height = len(contents)
-        self.width = max(len(line) for line in contents)
+        self.solution = None
+        self.explored = None
+        self.distances = None
+
+        # Jump point search stops of each row, filled in by row_stops
+        self.stops = [None] * self.height
+
 
-        # Keep track of walls
-        self.walls = []
+
+    def relayout(self, old_stride, new_stride):
+        """
+        Re-lays the rows read so far from old_stride to new_stride bytes
+        apart, padding with open cells or cutting spare columns.
+        Returns new_stride.
+        """
+        keep = min(old_stride, new_stride)
+        walls = bytearray(self.height * new_stride)
         for i in range(self.height):
-            row = []
-            for j in range(self.width):
-                try:
-                    if contents[i][j] == "A":
-                        self.start = (i, j)
-                        row.append(False)
-                    elif contents[i][j] == "B":
-                        self.goal = (i, j)
-                        row.append(False)
-                    elif contents[i][j] == " ":
-                        row.append(False)
-                    else:
-                        row.append(True)
-                except IndexError:
-                    row.append(False)
-            self.walls.append(row)
+            walls[i * new_stride:i * new_stride + keep] = self.walls[i * old_stride:i * old_stride + keep]
+        self.walls = walls
+        return new_stride
 
-        self.solution = None
+    def index(self, state):
+        """Flat grid index of a (row, col) state."""
+        return state[0] * self.width + state[1]
+
+    def cell(self, index):
+        """(row, col) state of a flat grid index."""
+        return divmod(index, self.width)
 
 
 
     def print(self):
-        solution = self.solution[1] if self.solution is not None else None
+        # Overlay start, goal and solution on a copy of the wall grid,
+        # then translate whole rows to characters at once
+        cells = self.cell_codes(show_solution=True, show_explored=False)
+        table = {0: " ", 1: "\u2588", 2: "A", 3: "B", 4: "*"}
+        rows = (
+            cells[i * self.width:(i + 1) * self.width].decode("latin-1").translate(table)
+            for i in range(self.height)
+        )
         print()
-        for i, row in enumerate(self.walls):
-            for j, col in enumerate(row):
-                if col:
-                    print("\u2588", end="")
-                elif (i, j) == self.start:
-                    print("A", end="")
-                elif (i, j) == self.goal:
-                    print("B", end="")
-                elif solution is not None and (i, j) in solution:
-                    print("*", end="")
-                else:
-                    print(" ", end="")
-            print()
+        print("\n".join(rows))
         print()
 
+    def cell_codes(self, show_solution=True, show_explored=False):
+        """
+        Returns a bytearray with one code per cell: 0 empty, 1 wall,
+        2 start, 3 goal, 4 solution, 5 explored.
+        """
+        cells = bytearray(self.walls)
+        if self.solution is not None:
+            if show_explored:
+                # Explored cells are never walls, so OR-ing the two byte
+                # strings as big integers merges them in one C-level pass
+                explored = self.explored.translate(bytes([0, 5]) + bytes(254))
+                merged = int.from_bytes(cells, "little") | int.from_bytes(explored, "little")
+                cells = bytearray(merged.to_bytes(len(cells), "little"))
+            if show_solution:
+                for i, j in self.solution[1]:
+                    cells[i * self.width + j] = 4
+        cells[self.index(self.start)] = 2
+        cells[self.index(self.goal)] = 3
+        return cells
 
 
-    def neighbors(self, state):
-        row, col = state
-        candidates = [
-            ("up", (row - 1, col)),
-            ("down", (row + 1, col)),
-            ("left", (row, col - 1)),
-            ("right", (row, col + 1))
-        ]
 
+    def neighbors(self, state):
+        return [(action, self.cell(index))
+                for action, index in self.neighbor_indices(self.index(state))]
+
+    def neighbor_indices(self, index):
+        """
+        Returns (action, index) pairs for the open cells next to a flat
+        grid index, using the precomputed offsets of the four moves.
+        """
+        walls = self.walls
+        width = self.width
+        col = index % width
         result = []
-        for action, (r, c) in candidates:
-            if 0 <= r < self.height and 0 <= c < self.width and not self.walls[r][c]:
-                result.append((action, (r, c)))
+        up = index - width
+        if up >= 0 and not walls[up]:
+            result.append(("up", up))
+        down = index + width
+        if down < len(walls) and not walls[down]:
+            result.append(("down", down))
+        if col > 0 and not walls[index - 1]:
+            result.append(("left", index - 1))
+        if col < width - 1 and not walls[index + 1]:
+            result.append(("right", index + 1))
         return result
 
 
 
-    def solve(self):
-        """Finds a solution to maze, if one exists."""
+    def goal_distance(self, index):
+        """Manhattan distance from a flat grid index to the goal."""
+        row, col = divmod(index, self.width)
+        return abs(row - self.goal[0]) + abs(col - self.goal[1])
+
+    def frontier(self, mode):
+        """Returns an empty frontier implementing the given solver mode."""
+        if mode == "dfs":
+            return IndexedStackFrontier()
+        elif mode == "bfs":
+            return IndexedQueueFrontier()
+
+        distance = self.goal_distance
+        if mode == "greedy":
+            return PriorityFrontier(lambda node: distance(node.state))
+        elif mode == "astar":
+            # Among equal f = g + h prefer the node closer to the goal
+            return PriorityFrontier(
+                lambda node: (node.cost + distance(node.state), distance(node.state))
+            )
+        else:
+            raise Exception(f"unknown solver mode: {mode}")
+
+    def distance_field(self):
+        """
+        Returns a NumPy array with the number of steps from the start to
+        every cell (-1 for walls and unreachable cells), computed once
+        by breadth-first wavefront propagation and then cached.
+        """
+        import numpy as np
+
+        if self.distances is not None:
+            return self.distances
+
+        size = self.height * self.width
+        width = self.width
+        distances = np.full(size, -1, dtype=np.int32)
+        start = self.index(self.start)
+        distances[start] = 0
+
+        # Cells that are walls or already reached, shared with NumPy
+        seen = bytearray(self.walls)
+        seen[start] = 1
+        seen_array = np.frombuffer(seen, dtype=np.uint8)
+
+        # The wavefront is the list of flat indices reached at the last
+        # step. Each step gathers their four neighbors (masking moves off
+        # the left/right edge and past the top/bottom row) and keeps the
+        # unseen ones, so the total work is proportional to the number of
+        # cells reached. Wide fronts go through NumPy; narrow ones, as in
+        # long corridors, are cheaper to expand in plain Python
+        front = [start]
+        step = 0
+        while len(front):
+            step += 1
+            if len(front) < 64:
+                next_front = []
+                for index in front:
+                    col = index % width
+                    if col > 0 and not seen[index - 1]:
+                        seen[index - 1] = 1
+                        next_front.append(index - 1)
+                    if col < width - 1 and not seen[index + 1]:
+                        seen[index + 1] = 1
+                        next_front.append(index + 1)
+                    if index >= width and not seen[index - width]:
+                        seen[index - width] = 1
+                        next_front.append(index - width)
+                    if index < size - width and not seen[index + width]:
+                        seen[index + width] = 1
+                        next_front.append(index + width)
+                front = next_front
+            else:
+                front = np.asarray(front, dtype=np.intp)
+                cols = front % width
+                neighbors = np.concatenate((
+                    front[cols > 0] - 1,
+                    front[cols < width - 1] + 1,
+                    front[front >= width] - width,
+                    front[front < size - width] + width
+                ))
+                front = np.unique(neighbors[seen_array[neighbors] == 0])
+                seen_array[front] = 1
+                if len(front) < 64:
+                    front = front.tolist()
+            distances[front] = step
+
+        distances = distances.reshape(self.height, self.width)
+        self.distances = distances
+        return distances
+
+    def path_to(self, target):
+        """
+        Returns (actions, cells) for a shortest path from the start to
+        target, read off the distance field by stepping downhill from
+        target. Many targets can be queried for one field computation.
+        """
+        distances = self.distance_field()
+        if distances[target] < 0:
+            raise Exception("no solution")
+
+        moves = [("down", (-1, 0)), ("up", (1, 0)), ("right", (0, -1)), ("left", (0, 1))]
+        actions = []
+        cells = []
+        row, col = target
+        while (row, col) != self.start:
+            actions.append(None)
+            cells.append((row, col))
+            for action, (dr, dc) in moves:
+                r, c = row + dr, col + dc
+                if (0 <= r < self.height and 0 <= c < self.width
+                        and distances[r, c] == distances[row, col] - 1):
+                    actions[-1] = action
+                    row, col = r, c
+                    break
+        actions.reverse()
+        cells.reverse()
+        return actions, cells
+
+    def row_stops(self, row):
+        """
+        Returns (rightward, leftward): the sorted columns of a row where a
+        horizontal run moving right, or left, stops before any wall.
+
+        A run stops at the goal or next to a forced neighbor: an open cell
+        above/below whose counterpart one step back is a wall. Those are
+        found with bytes searches over the adjacent rows, and each row is
+        computed the first time a run crosses it, into a per-row table of
+        int32 columns that only grows with the walls of the rows visited.
+        """
+        width = self.width
+        line = self.walls[row * width:(row + 1) * width]
+        rightward, leftward = set(), set()
+        for side in (row - 1, row + 1):
+            if not 0 <= side < self.height:
+                continue
+            other = self.walls[side * width:(side + 1) * width]
+            col = other.find(b"\x01\x00")
+            while col >= 0:
+                rightward.add(col + 1)
+                col = other.find(b"\x01\x00", col + 1)
+            col = other.find(b"\x00\x01")
+            while col >= 0:
+                leftward.add(col)
+                col = other.find(b"\x00\x01", col + 1)
+        if row == self.goal[0]:
+            rightward.add(self.goal[1])
+            leftward.add(self.goal[1])
+
+        stops = tuple(array("i", sorted(col for col in cols if not line[col]))
+                      for cols in (rightward, leftward))
+        self.stops[row] = stops
+        return stops
+
+    def horizontal_run(self, row, col, dcol):
+        """
+        Returns the column of the jump point reached by a horizontal run
+        from (row, col) in direction dcol, or -1 if a wall comes first.
+        With dcol 0 either direction will do.
+
+        The run is not walked: the next stop of the row (see row_stops)
+        is found by bisection and the next wall by a bytes search.
+        """
+        rightward, leftward = self.stops[row] or self.row_stops(row)
+        base = row * self.width
+        if dcol >= 0:
+            i = bisect.bisect_right(rightward, col)
+            if i < len(rightward):
+                wall = self.walls.find(1, base + col + 1, base + rightward[i])
+                if wall < 0:
+                    return rightward[i]
+        if dcol <= 0:
+            i = bisect.bisect_left(leftward, col) - 1
+            if i >= 0:
+                wall = self.walls.rfind(1, base + leftward[i] + 1, base + col)
+                if wall < 0:
+                    return leftward[i]
+        return -1
+
+    def jump(self, index, direction):
+        """
+        Moves from a flat grid index towards DIRECTIONS[direction] until
+        reaching a jump point, whose index is returned, or a wall, in
+        which case -1.
+
+        Vertical runs stop at the goal or wherever a horizontal run from
+        the current cell would find a jump point, which only takes one
+        lookup in the row's stops per step.
+        """
+        _, drow, dcol = DIRECTIONS[direction]
+        row, col = self.cell(index)
+        if drow == 0:
+            stop = self.horizontal_run(row, col, dcol)
+            return -1 if stop < 0 else index + stop - col
+
+        walls = self.walls
+        step = drow * self.width
+        goal = self.index(self.goal)
+        while True:
+            row += drow
+            index += step
+            if not 0 <= row < self.height or walls[index]:
+                return -1
+            if index == goal or self.horizontal_run(row, col, 0) >= 0:
+                return index
+
+    def jump_directions(self, index, direction):
+        """
+        Directions (indices into DIRECTIONS) worth searching from a jump
+        point reached by moving towards direction: all four from the
+        start, straight on plus both sides after a vertical move,
+        straight on plus open vertical sides after a horizontal move.
+        """
+        if direction is None:
+            return range(len(DIRECTIONS))
+        if DIRECTIONS[direction][2] == 0:
+            return [direction, 2, 3]
+        result = [direction]
+        width = self.width
+        if index >= width and not self.walls[index - width]:
+            result.append(0)
+        if index + width < len(self.walls) and not self.walls[index + width]:
+            result.append(1)
+        return result
+
+    def solve_jps(self, stats=None):
+        """
+        Jump point search: A* over jump points only, with the symmetric
+        orderings of equally short paths pruned. Finds paths as short as
+        breadth-first search while expanding far fewer states in open
+        areas. States are (flat index, direction of arrival) pairs so
+        that pruning by direction of arrival stays correct.
+        """
+        def priority(node):
+            distance = self.goal_distance(node.state[0])
+            return node.cost + distance, distance
+
+        width = self.width
+        goal = self.index(self.goal)
+        self.num_explored = 0
+        self.explored = bytearray(len(self.walls))
+        frontier = PriorityFrontier(priority)
+        frontier.add(Node(state=(self.index(self.start), None), parent=None, action=None))
+        closed = set()
+
+        while True:
+            if frontier.empty():
+                raise Exception("no solution")
+
+            node = frontier.remove()
+            self.num_explored += 1
+            index, direction = node.state
+            self.explored[index] = 1
+            if stats is not None:
+                stats.expand(self.cell(index), len(frontier) + 1)
+
+            if index == goal:
+                actions = []
+                cells = []
+
+                # Unroll the straight segments between jump points
+                while node.parent is not None:
+                    index, direction = node.state
+                    _, drow, dcol = DIRECTIONS[direction]
+                    parent = node.parent.state[0]
+                    while index != parent:
+                        actions.append(node.action)
+                        cells.append(self.cell(index))
+                        index -= drow * width + dcol
+                    node = node.parent
+
+                actions.reverse()
+                cells.reverse()
+                self.solution = (actions, cells)
+                return
+
+            closed.add(node.state)
+            for turn in self.jump_directions(index, direction):
+                point = self.jump(index, turn)
+                if point < 0 or (point, turn) in closed:
+                    continue
+                action, drow, _ = DIRECTIONS[turn]
+                cost = node.cost + abs(point - index) // (width if drow else 1)
+                frontier.add(Node(state=(point, turn), parent=node, action=action, cost=cost))
+
+    def solve(self, stats=None, mode="dfs"):
+        """
+        Finds a solution to maze, if one exists.
+
+        mode is one of MODES: depth-first, breadth-first, greedy
+        best-first or A* search, the last two guided by the Manhattan
+        distance to the goal, a lookup in the NumPy distance field
+        (see distance_field), or jump point search (see solve_jps).
+        If a SearchStats is passed as stats, the node-based searches
+        record their work there.
+
+        Nodes hold flat grid indices; self.explored is a bitmap with
+        one byte per cell, set for every explored cell.
+        """
+
+        if mode == "wavefront":
+            distances = self.distance_field()
+            reached = (distances >= 0).ravel()
+            self.explored = bytearray(reached.astype("uint8").tobytes())
+            self.num_explored = int(reached.sum())
+            self.solution = self.path_to(self.goal)
+            return
+        elif mode == "jps":
+            self.solve_jps(stats)
+            return
 
         # Keep track of number of states explored
         self.num_explored = 0
 
         # Initialize frontier to just the starting position
-        start = Node(state=self.start, parent=None, action=None)
-        frontier = StackFrontier()
+        start = Node(state=self.index(self.start), parent=None, action=None)
+        goal = self.index(self.goal)
+        frontier = self.frontier(mode)
         frontier.add(start)
 
-        # Initialize an empty explored set
-        self.explored = set()
+        # Priority frontiers handle states already in them (decrease-key)
+        reopen = isinstance(frontier, PriorityFrontier)
+
+        # Initialize an empty explored bitmap
+        explored = self.explored = bytearray(len(self.walls))
 
         # Keep looping until solution found
         while True:
@@ -157,14 +667,14 @@ class Maze():
             self.num_explored += 1
 
             # If node is the goal, then we have a solution
-            if node.state == self.goal:
+            if node.state == goal:
                 actions = []
                 cells = []
                 
                 # Follow parent nodes to find solution
                 while node.parent is not None:
                     actions.append(node.action)
-                    cells.append(node.state)
+                    cells.append(self.cell(node.state))
                     node = node.parent
                     
                 actions.reverse()
@@ -173,75 +683,181 @@ class Maze():
                 return
 
             # Mark node as explored
-            self.explored.add(node.state)
+            explored[node.state] = 1
+
+            if stats is None:
+                neighbors = self.neighbor_indices(node.state)
+            else:
+                stats.expand(self.cell(node.state), len(frontier) + 1)
+                clock = time.perf_counter()
+                neighbors = self.neighbor_indices(node.state)
+                stats.neighbor_seconds += time.perf_counter() - clock
+                clock = time.perf_counter()
 
             # Add neighbors to frontier
-            for action, state in self.neighbors(node.state):
-                if not frontier.contains_state(state) and state not in self.explored:
-                    child = Node(state=state, parent=node, action=action)
+            for action, state in neighbors:
+                if not explored[state] and (reopen or not frontier.contains_state(state)):
+                    child = Node(state=state, parent=node, action=action, cost=node.cost + 1)
                     frontier.add(child)
 
+            if stats is not None:
+                stats.membership_seconds += time.perf_counter() - clock
+
 
-    def output_image(self, filename, show_solution=True, show_explored=False):
+    def output_image(self, filename, show_solution=True, show_explored=False, cell_size=50):
         from PIL import Image, ImageDraw
-        cell_size = 50
         cell_border = 2
 
-        # Create a blank canvas
-        img = Image.new(
-            "RGBA",
-            (self.width * cell_size, self.height * cell_size),
-            "black"
-        )
-        draw = ImageDraw.Draw(img)
-
-        solution = self.solution[1] if self.solution is not None else None
-        for i, row in enumerate(self.walls):
-            for j, col in enumerate(row):
-
-                # Walls
-                if col:
-                    fill = (40, 40, 40)
-
-                # Start
-                elif (i, j) == self.start:
-                    fill = (255, 0, 0)
-
-                # Goal
-                elif (i, j) == self.goal:
-                    fill = (0, 171, 28)
-
-                # Solution
-                elif solution is not None and show_solution and (i, j) in solution:
-                    fill = (220, 235, 113)
-
-                # Explored
-                elif solution is not None and show_explored and (i, j) in self.explored:
-                    fill = (212, 97, 85)
-
-                # Empty cell
-                else:
-                    fill = (237, 240, 252)
-
-                # Draw cell
-                draw.rectangle(
-                    ([(j * cell_size + cell_border, i * cell_size + cell_border),
-                      ((j + 1) * cell_size - cell_border, (i + 1) * cell_size - cell_border)]),
-                    fill=fill
-                )
-
-        img.save(filename)
-
-
-if len(sys.argv) != 2:
-    sys.exit("Usage: python maze.py maze.txt")
-
-m = Maze(sys.argv[1])
-print("Maze:")
-m.print()
-print("Solving...")
-m.solve()
-print("States Explored:", m.num_explored)
-print("Solution:")
-m.print()
-m.output_image("maze.png", show_explored=True)
\ No newline at end of file
+        palette = [
+            (237, 240, 252, 255),   # Empty cell
+            (40, 40, 40, 255),      # Walls
+            (255, 0, 0, 255),       # Start
+            (0, 171, 28, 255),      # Goal
+            (220, 235, 113, 255),   # Solution
+            (212, 97, 85, 255)      # Explored
+        ]
+        cells = self.cell_codes(show_solution, show_explored)
+
+        # NumPy is optional: without it PIL scales up a palette image and
+        # the borders are drawn as one black band per grid line
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+
+        if np is None:
+            width, height = self.width * cell_size, self.height * cell_size
+            image = Image.frombytes("P", (self.width, self.height), bytes(cells))
+            image.putpalette([channel for color in palette for channel in color[:3]])
+            image = image.resize((width, height), Image.NEAREST).convert("RGBA")
+            draw = ImageDraw.Draw(image)
+            bands = [(0, cell_border - 1), (cell_size - cell_border + 1, cell_size - 1)]
+            for first, last in bands:
+                if first > last:
+                    continue
+                for i in range(self.height):
+                    draw.rectangle([(0, i * cell_size + first), (width - 1, i * cell_size + last)], fill="black")
+                for j in range(self.width):
+                    draw.rectangle([(j * cell_size + first, 0), (j * cell_size + last, height - 1)], fill="black")
+            image.save(filename)
+            return
+
+        # One palette index per cell, blown up to cell_size x cell_size
+        # blocks by replication, then a black border around every cell
+        colors = np.array(palette, dtype=np.uint8)
+        cells = np.frombuffer(cells, dtype=np.uint8).reshape(self.height, self.width)
+        pixels = colors[cells.repeat(cell_size, axis=0).repeat(cell_size, axis=1)]
+
+        inside = np.zeros(cell_size, dtype=bool)
+        inside[cell_border:cell_size - cell_border + 1] = True
+        rows = np.tile(inside, self.height)
+        cols = np.tile(inside, self.width)
+        pixels[~rows, :, :3] = 0
+        pixels[:, ~cols, :3] = 0
+
+        Image.fromarray(pixels, "RGBA").save(filename)
+
+def compare_modes(maze, modes=MODES):
+    """
+    Solves maze with each mode and returns (mode, path length,
+    states explored, seconds) rows; length is None if unsolved.
+    """
+    rows = []
+    for mode in modes:
+        start = time.perf_counter()
+        try:
+            maze.solve(mode=mode)
+            length = len(maze.solution[1])
+        except Exception:
+            length = None
+        rows.append((mode, length, maze.num_explored, time.perf_counter() - start))
+    return rows
+
+
+def solve_file(filename, mode="astar"):
+    """
+    Loads and solves one maze file, returning a summary dictionary
+    with path length, states explored and time taken (or the error).
+    """
+    summary = {"maze": filename, "mode": mode, "length": None,
+               "explored": None, "seconds": None, "error": None}
+    start = time.perf_counter()
+    try:
+        maze = Maze(filename)
+        maze.solve(mode=mode)
+        summary["length"] = len(maze.solution[1])
+        summary["explored"] = maze.num_explored
+    except Exception as e:
+        summary["error"] = str(e)
+    summary["seconds"] = round(time.perf_counter() - start, 6)
+    return summary
+
+
+def solve_directory(directory, mode="astar", workers=None, pattern="*.txt"):
+    """
+    Solves every maze file matching pattern in directory in parallel
+    worker processes. Returns the solve_file summaries sorted by file name.
+    """
+    import glob
+    import os
+    from concurrent.futures import ProcessPoolExecutor
+
+    filenames = sorted(glob.glob(os.path.join(directory, pattern)))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(solve_file, filenames, [mode] * len(filenames)))
+
+
+def write_summary(summaries, filename):
+    """Writes solve_file summaries as CSV."""
+    import csv
+
+    with open(filename, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["maze", "mode", "length", "explored", "seconds", "error"])
+        writer.writeheader()
+        writer.writerows(summaries)
+
+
+def main():
+    usage = (f"Usage: python maze.py maze.txt [{'|'.join(MODES)}|compare]\n"
+             f"       python maze.py --batch directory [mode] [summary.csv]")
+
+    if len(sys.argv) >= 3 and sys.argv[1] == "--batch":
+        if len(sys.argv) > 5 or (len(sys.argv) >= 4 and sys.argv[3] not in MODES):
+            sys.exit(usage)
+        mode = sys.argv[3] if len(sys.argv) >= 4 else "astar"
+        summaries = solve_directory(sys.argv[2], mode)
+        for summary in summaries:
+            if summary["error"] is None:
+                print(f"{summary['maze']}: length {summary['length']}, "
+                      f"explored {summary['explored']}, {summary['seconds']:.4f}s")
+            else:
+                print(f"{summary['maze']}: {summary['error']}")
+        if len(sys.argv) == 5:
+            write_summary(summaries, sys.argv[4])
+        return
+
+    if len(sys.argv) == 3 and sys.argv[2] == "compare":
+        print(f"{'mode':<10} {'length':>8} {'explored':>10} {'seconds':>10}")
+        for mode, length, explored, seconds in compare_modes(Maze(sys.argv[1])):
+            print(f"{mode:<10} {str(length):>8} {explored:>10} {seconds:>10.4f}")
+        return
+
+    if len(sys.argv) not in [2, 3] or (len(sys.argv) == 3 and sys.argv[2] not in MODES):
+        sys.exit(usage)
+    mode = sys.argv[2] if len(sys.argv) == 3 else "dfs"
+
+    m = Maze(sys.argv[1])
+    print("Maze:")
+    m.print()
+    print(f"Solving ({mode})...")
+    stats = SearchStats()
+    m.solve(stats, mode)
+    print("States Explored:", m.num_explored)
+    print("Search:", stats)
+    print("Solution:")
+    m.print()
+    m.output_image("maze.png", show_explored=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import argparse
+import random
+import sys
+import time
+
+# Genera labirinti nel formato letto da 02_maze.py ('#' muro, ' ' libero,
+# A partenza, B arrivo). La griglia è un bytearray piatto (1 = muro) come
+# in Maze; le celle "logiche" stanno alle coordinate dispari e i muri tra
+# di esse vengono abbattuti dall'algoritmo scelto
+
+
+def blank(height, width):
+    """Returns a grid of height * width wall cells."""
+    # Below 5 cells a side there is a single logical cell, so the start
+    # and goal would coincide
+    if height < 5 or width < 5:
+        raise Exception("maze must be at least 5x5")
+    return bytearray(b"\x01" * (height * width))
+
+
+def backtracker(height, width, rng):
+    """
+    Recursive backtracker (iterative depth-first search): long winding
+    corridors with few branches.
+    """
+    grid = blank(height, width)
+    rows, cols = (height - 1) // 2, (width - 1) // 2
+
+    start = width + 1
+    grid[start] = 0
+    stack = [start]
+    while stack:
+        index = stack[-1]
+        row, col = divmod(index, width)
+        choices = []
+        for drow, dcol in ((-2, 0), (2, 0), (0, -2), (0, 2)):
+            r, c = row + drow, col + dcol
+            if 1 <= r <= 2 * rows - 1 and 1 <= c <= 2 * cols - 1 and grid[r * width + c]:
+                choices.append((r * width + c, (row + drow // 2) * width + col + dcol // 2))
+        if not choices:
+            stack.pop()
+            continue
+        cell, between = rng.choice(choices)
+        grid[between] = 0
+        grid[cell] = 0
+        stack.append(cell)
+    return grid
+
+
+def prim(height, width, rng):
+    """
+    Randomized Prim's algorithm: many short dead ends branching from
+    everywhere.
+    """
+    grid = blank(height, width)
+    rows, cols = (height - 1) // 2, (width - 1) // 2
+
+    def add_walls(row, col):
+        for drow, dcol in ((-2, 0), (2, 0), (0, -2), (0, 2)):
+            r, c = row + drow, col + dcol
+            if 1 <= r <= 2 * rows - 1 and 1 <= c <= 2 * cols - 1 and grid[r * width + c]:
+                frontier.append((r * width + c, (row + drow // 2) * width + col + dcol // 2))
+
+    frontier = []
+    grid[width + 1] = 0
+    add_walls(1, 1)
+    while frontier:
+        # Pick a random frontier wall, removing it by swapping with the last
+        i = rng.randrange(len(frontier))
+        frontier[i], frontier[-1] = frontier[-1], frontier[i]
+        cell, between = frontier.pop()
+        if grid[cell]:
+            grid[between] = 0
+            grid[cell] = 0
+            add_walls(*divmod(cell, width))
+    return grid
+
+
+def rooms(height, width, rng, count=None):
+    """
+    A backtracker maze with random rectangular rooms cleared out of it,
+    giving open areas joined by corridors.
+    """
+    grid = backtracker(height, width, rng)
+    if count is None:
+        count = max(1, height * width // 400)
+    for _ in range(count):
+        room_height = rng.randint(3, max(3, min(15, height // 4)))
+        room_width = rng.randint(3, max(3, min(15, width // 4)))
+        top = rng.randint(1, max(1, height - 1 - room_height))
+        left = rng.randint(1, max(1, width - 1 - room_width))
+        for row in range(top, min(top + room_height, height - 1)):
+            start = row * width + left
+            end = row * width + min(left + room_width, width - 1)
+            grid[start:end] = bytes(end - start)
+    return grid
+
+
+ALGORITHMS = {"backtracker": backtracker, "prim": prim, "rooms": rooms}
+
+
+def generate(algorithm, height, width, seed=None):
+    """
+    Returns a maze as a bytearray grid (1 = wall) with its start and
+    goal cells, A in the top-left and B in the bottom-right open cell.
+    """
+    rng = random.Random(seed)
+    grid = ALGORITHMS[algorithm](height, width, rng)
+    start = (1, 1)
+    goal = (2 * ((height - 1) // 2) - 1, 2 * ((width - 1) // 2) - 1)
+    return grid, start, goal
+
+
+def write(filename, grid, width, start, goal):
+    """Writes a grid in the '#'/space/A/B text format, row by row."""
+    table = bytes.maketrans(b"\x00\x01", b" #")
+    with open(filename, "wb") as f:
+        for row in range(len(grid) // width):
+            line = bytearray(grid[row * width:(row + 1) * width].translate(table))
+            if row == start[0]:
+                line[start[1]] = ord("A")
+            if row == goal[0]:
+                line[goal[1]] = ord("B")
+            f.write(line + b"\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate maze files for 02_maze.py.")
+    parser.add_argument("algorithm", choices=list(ALGORITHMS))
+    parser.add_argument("height", type=int)
+    parser.add_argument("width", type=int)
+    parser.add_argument("output")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+    try:
+        grid, start, goal = generate(args.algorithm, args.height, args.width, args.seed)
+    except Exception as e:
+        sys.exit(str(e))
+    write(args.output, grid, args.width, start, goal)
+    print(f"{args.height}x{args.width} {args.algorithm} maze written to {args.output} "
+          f"in {time.perf_counter() - start_time:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
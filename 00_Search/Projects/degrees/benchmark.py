@@ -0,0 +1,192 @@
+"""
+Benchmark harness for degrees search.
+
+Generates synthetic actor/movie datasets with power-law popularity at
+the requested numbers of stars, then for each scale measures load time,
+peak RSS, and per search mode the nodes explored and p50/p99 latency of
+a fixed, seeded query set. Results are written as JSON.
+
+    python benchmark.py --scales 10000,100000,1000000 --output report.json
+"""
+
+import argparse
+import concurrent.futures
+import csv
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+import degrees
+from snapshot import read_snapshot, write_snapshot
+from util import SearchStats
+
+MODES = {
+    "bfs": {"bidirectional": False},
+    "bidirectional": {"bidirectional": True}
+}
+
+
+def generate(directory, stars, seed=0):
+    """
+    Writes people.csv, movies.csv and stars.csv with about stars star
+    rows to directory. Both the number of movies a person appears in
+    and the cast size of a movie follow heavy-tailed distributions.
+    """
+    rng = random.Random(seed)
+    num_people = max(2, stars // 4)
+    num_movies = max(1, stars // 8)
+    os.makedirs(directory, exist_ok=True)
+
+    with open(os.path.join(directory, "people.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "name", "birth"])
+        for person in range(num_people):
+            writer.writerow([person, f"Person {person}", 1900 + rng.randrange(110)])
+
+    with open(os.path.join(directory, "movies.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "title", "year"])
+        for movie in range(num_movies):
+            writer.writerow([movie, f"Movie {movie}", 1920 + rng.randrange(100)])
+
+    # Popular people are drawn far more often: a skewed rank (density
+    # falling off as a power of the rank) maps onto a shuffled id space
+    # so popularity is not tied to id order
+    ranks = list(range(num_people))
+    rng.shuffle(ranks)
+    with open(os.path.join(directory, "stars.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["person_id", "movie_id"])
+        written = 0
+        while written < stars:
+            movie = rng.randrange(num_movies)
+            cast = min(stars - written, int(rng.paretovariate(1.5)) + 1, 100)
+            for _ in range(cast):
+                rank = int(num_people * rng.random() ** 3)
+                writer.writerow([ranks[rank], movie])
+            written += cast
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    if not values:
+        return None
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def run_scale(directory, queries, modes, seed):
+    """
+    Loads one dataset in a fresh process and runs the query set.
+    Returns the measurements for that scale.
+    """
+    start = time.perf_counter()
+    report = degrees.load_data(directory, use_snapshot=False)
+    load_seconds = time.perf_counter() - start
+
+    # Time a snapshot load as well; the first call only writes it
+    write_snapshot(directory, degrees.graph, degrees.name_index)
+    start = time.perf_counter()
+    read_snapshot(directory)
+    snapshot_seconds = time.perf_counter() - start
+
+    # Query people who appear in at least one movie
+    graph = degrees.graph
+    people = [graph.person_ids[person] for person in range(len(graph.person_ids))
+              if graph.person_offsets[person] < graph.person_offsets[person + 1]]
+    rng = random.Random(seed)
+    pairs = [(rng.choice(people), rng.choice(people)) for _ in range(queries)]
+
+    results = {
+        "directory": directory,
+        "people": len(graph.person_ids),
+        "movies": len(graph.movie_ids),
+        "stars": len(graph.person_movies),
+        "dropped_rows": report.dropped,
+        "load_seconds": load_seconds,
+        "snapshot_load_seconds": snapshot_seconds,
+        "modes": {}
+    }
+    for mode in modes:
+        latencies = []
+        explored = []
+        connected = 0
+        for source, target in pairs:
+            start = time.perf_counter()
+            path = degrees.shortest_path(source, target, **MODES[mode])
+            latencies.append(time.perf_counter() - start)
+            connected += path is not None
+
+        # Count expansions in a second pass so the bookkeeping stays
+        # out of the timings
+        for source, target in pairs:
+            stats = SearchStats()
+            degrees.shortest_path(source, target, stats=stats, **MODES[mode])
+            explored.append(stats.expanded)
+        results["modes"][mode] = {
+            "queries": len(pairs),
+            "connected": connected,
+            "nodes_explored_mean": sum(explored) / len(explored) if explored else None,
+            "p50_ms": percentile(latencies, 0.50) * 1000 if latencies else None,
+            "p99_ms": percentile(latencies, 0.99) * 1000 if latencies else None
+        }
+
+    # ru_maxrss is reported in kilobytes on Linux and bytes on macOS;
+    # the resource module does not exist on Windows
+    try:
+        import resource
+    except ImportError:
+        results["peak_rss_mb"] = None
+    else:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        results["peak_rss_mb"] = peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark degrees search on synthetic data.")
+    parser.add_argument("--scales", default="10000,100000",
+                        help="comma-separated numbers of star rows")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data", default="benchmark_data",
+                        help="directory for the generated datasets")
+    parser.add_argument("--output", default="benchmark.json")
+    args = parser.parse_args()
+
+    modes = args.modes.split(",")
+    for mode in modes:
+        if mode not in MODES:
+            sys.exit(f"Unknown mode: {mode}")
+
+    report = {"seed": args.seed, "scales": []}
+    for stars in (int(scale) for scale in args.scales.split(",")):
+        directory = os.path.join(args.data, str(stars))
+        if not os.path.exists(os.path.join(directory, "stars.csv")):
+            print(f"Generating {stars} stars...")
+            generate(directory, stars, args.seed)
+
+        # A fresh process per scale keeps peak RSS figures independent
+        context = multiprocessing.get_context("spawn")
+        with concurrent.futures.ProcessPoolExecutor(1, mp_context=context) as executor:
+            results = executor.submit(run_scale, directory, args.queries, modes, args.seed).result()
+        results["scale"] = stars
+        report["scales"].append(results)
+
+        peak = results["peak_rss_mb"]
+        print(f"{stars} stars: load {results['load_seconds']:.2f}s, "
+              f"snapshot {results['snapshot_load_seconds']:.3f}s, "
+              f"peak RSS {'unknown' if peak is None else f'{peak:.0f} MB'}")
+        for mode, timings in results["modes"].items():
+            print(f"  {mode}: p50 {timings['p50_ms']:.2f} ms, p99 {timings['p99_ms']:.2f} ms, "
+                  f"{timings['nodes_explored_mean']:.0f} nodes explored")
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
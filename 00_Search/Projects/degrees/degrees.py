@@ -1,60 +1,107 @@
-import csv
+import itertools
+import multiprocessing
 import sys
-from util import Node, StackFrontier, QueueFrontier
+import time
+from graph import GraphBuilder
+from loader import LoadReport, stream_rows
+import nameindex
+from snapshot import read_snapshot, write_snapshot
+from util import Node, IndexedQueueFrontier, LRUCache
 
-# Maps names to a set of corresponding person_ids
-names = {}
-
-# Maps person_ids to a dictionary of: name, birth, movies (a set of movie_ids)
+# Maps person_ids to a dictionary of: name, birth (see graph.Records)
 people = {}
 
-# Maps movie_ids to a dictionary of: title, year, stars (a set of person_ids)
+# Maps movie_ids to a dictionary of: title, year (see graph.Records)
 movies = {}
 
+# Compact person <-> movie graph, see graph.Graph
+graph = None
+
+# Recent neighbors_for_person results, see configure_neighbor_cache
+neighbor_cache = None
+
+# Exact, prefix and fuzzy lookup of person_ids by name, see nameindex.NameIndex.
+# Built by load_data and stored in the snapshot, so no query pays for it
+name_index = None
 
-def load_data(directory):
+
+def load_data(directory, use_snapshot=True, workers=0):
     """
     Load data from CSV files into memory.
+
+    Unless use_snapshot is False, a binary snapshot of the parsed data is
+    kept next to the CSV files and reused while they are unchanged.
+    With workers > 0 the CSV files are parsed in that many processes.
+    Returns a loader.LoadReport, or None when the snapshot was used.
     """
-    # Load people
-    with open(f"{directory}/people.csv", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            people[row["id"]] = {
-                "name": row["name"],
-                "birth": row["birth"],
-                "movies": set()
-            }
-            if row["name"].lower() not in names:
-                names[row["name"].lower()] = {row["id"]}
-            else:
-                names[row["name"].lower()].add(row["id"])
-
-    # Load movies
-    with open(f"{directory}/movies.csv", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            movies[row["id"]] = {
-                "title": row["title"],
-                "year": row["year"],
-                "stars": set()
-            }
-
-    # Load stars
-    with open(f"{directory}/stars.csv", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            try:
-                people[row["person_id"]]["movies"].add(row["movie_id"])
-                movies[row["movie_id"]]["stars"].add(row["person_id"])
-            except KeyError:
-                pass
+    global graph, people, movies, name_index
+
+    # Keep the bounds of a cache the caller configured, not its entries
+    if neighbor_cache is None:
+        configure_neighbor_cache()
+    else:
+        neighbor_cache.clear()
+
+    if use_snapshot:
+        snapshot = read_snapshot(directory)
+        if snapshot is not None:
+            graph, name_index = snapshot
+            people, movies = graph.people, graph.movies
+            return None
+
+    builder = GraphBuilder()
+    report = LoadReport()
+
+    for kind, rows in stream_rows(directory, report, workers):
+
+        # Load people
+        if kind == "people":
+            for person_id, name, birth in rows:
+                builder.add_person(person_id, name, birth)
+
+        # Load movies
+        elif kind == "movies":
+            for movie_id, title, year in rows:
+                builder.add_movie(movie_id, title, year)
+
+        # Load stars, moving rows that reference unknown ids from the
+        # accepted count to the dropped one
+        else:
+            for person_id, movie_id in rows:
+                if not builder.add_star(person_id, movie_id):
+                    report.rows["stars"] -= 1
+                    report.dropped["stars"] += 1
+
+    graph = builder.build()
+    people, movies = graph.people, graph.movies
+    name_index = nameindex.build(graph.person_ids, graph.people.fields["name"])
+
+    if use_snapshot:
+        write_snapshot(directory, graph, name_index)
+    return report
+
+
+def pool_context(directory):
+    """
+    Returns (context, initializer, initargs) for a multiprocessing pool
+    whose workers see the data loaded from directory.
+
+    Forked workers share the already loaded graph copy-on-write;
+    elsewhere each worker loads it (cheaply, from the snapshot).
+    """
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork"), None, ()
+    return multiprocessing.get_context(), load_data, (directory,)
 
 
 def main():
-    if len(sys.argv) > 2:
-        sys.exit("Usage: python degrees.py [directory]")
-    directory = sys.argv[1] if len(sys.argv) == 2 else "large"
+    args = sys.argv[1:]
+    bidirectional = "--bidirectional" in args
+    if bidirectional:
+        args.remove("--bidirectional")
+    if len(args) > 1:
+        sys.exit("Usage: python degrees.py [--bidirectional] [directory]")
+    directory = args[0] if len(args) == 1 else "large"
 
     # Load data from files into memory
     print("Loading data...")
@@ -68,7 +115,7 @@ def main():
     if target is None:
         sys.exit("Person not found.")
 
-    path = shortest_path(source, target)
+    path = shortest_path(source, target, bidirectional=bidirectional)
 
     if path is None:
         print("Not connected.")
@@ -83,14 +130,19 @@ def main():
             print(f"{i + 1}: {person1} and {person2} starred in {movie}")
 
 
-def shortest_path(source, target):
+def shortest_path(source, target, bidirectional=False, stats=None):
     """
     Returns the shortest list of (movie_id, person_id) pairs
     that connect the source to the target.
 
     If no possible path, returns None.
+    If a util.SearchStats is passed as stats, the search records
+    its work there.
     """
-    
+
+    if bidirectional:
+        return bidirectional_shortest_path(source, target, stats)
+
     # Return an empty list as it has length 0
     if source == target:
         return []
@@ -98,7 +150,7 @@ def shortest_path(source, target):
     explored = set() 
     
     start = Node(state=source, parent=None, action=None)
-    frontier = QueueFrontier()
+    frontier = IndexedQueueFrontier()
     frontier.add(start)
     
     while True:
@@ -108,7 +160,15 @@ def shortest_path(source, target):
         
         node = frontier.remove()      
         explored.add(node.state)       
-        neighbors = neighbors_for_person(node.state)
+
+        if stats is None:
+            neighbors = neighbors_for_person(node.state)
+        else:
+            stats.expand(node.state, len(frontier) + 1)
+            clock = time.perf_counter()
+            neighbors = neighbors_for_person(node.state)
+            stats.neighbor_seconds += time.perf_counter() - clock
+            clock = time.perf_counter()
 
         for movie, actor in neighbors:
             
@@ -133,45 +193,214 @@ def shortest_path(source, target):
                 # If target is not in child, add it to the frontier
                 frontier.add(child)
 
+        if stats is not None:
+            stats.membership_seconds += time.perf_counter() - clock
+
+
+def bidirectional_shortest_path(source, target, stats=None):
+    """
+    Same result as shortest_path, but grows a breadth-first search from
+    both ends, always expanding a whole layer of the smaller frontier,
+    and joins the two halves as soon as they meet.
+
+    Neighbor generation and membership checks are interleaved here,
+    so stats only records expansions and the frontier high-water mark.
+    """
+
+    if source == target:
+        return []
+
+    start = people.index(source)
+    goal = people.index(target)
+
+    # Map each reached person to the (movie, person) step leading back
+    # towards the source (forward) or towards the target (backward)
+    forward = {start: None}
+    backward = {goal: None}
+    forward_layer = [start]
+    backward_layer = [goal]
+
+    while forward_layer and backward_layer:
+        if len(forward_layer) <= len(backward_layer):
+            forward_layer, meet = expand_layer(forward_layer, forward, backward, stats)
+        else:
+            backward_layer, meet = expand_layer(backward_layer, backward, forward, stats)
+
+        if meet is not None:
+            pairs = []
+
+            # Walk from the meeting point back to the source...
+            person = meet
+            while forward[person] is not None:
+                movie, parent = forward[person]
+                pairs.append((graph.movie_ids[movie], graph.person_ids[person]))
+                person = parent
+            pairs.reverse()
+
+            # ...then forward from the meeting point to the target
+            person = meet
+            while backward[person] is not None:
+                movie, person = backward[person]
+                pairs.append((graph.movie_ids[movie], graph.person_ids[person]))
+            return pairs
+
+    return None
+
+
+def expand_layer(layer, parents, other, stats=None):
+    """
+    Expands every person index in layer, recording parents for newly
+    reached people. Returns the next layer and the first person also
+    reached by the other search, or None.
+    """
+    next_layer = []
+    for person in layer:
+        if stats is not None:
+            stats.expand(graph.person_ids[person], len(layer) + len(next_layer))
+        for movie, star in graph.costars(person):
+            if star not in parents:
+                parents[star] = (movie, person)
+                if star in other:
+                    return next_layer, star
+                next_layer.append(star)
+    return next_layer, None
+
+
+def shortest_paths(source, target, limit=None):
+    """
+    Yields every shortest list of (movie_id, person_id) pairs that
+    connect the source to the target, lazily, stopping after limit
+    paths if given. Yields nothing if there is no possible path.
+    """
+
+    if source == target:
+        yield []
+        return
+
+    start = people.index(source)
+    goal = people.index(target)
+
+    # Breadth-first layering that keeps every (movie, person) parent
+    # one layer closer to the source, i.e. a DAG of all shortest paths
+    depth = {start: 0}
+    parents = {start: []}
+    layer = [start]
+    while layer and goal not in depth:
+        next_layer = []
+        for person in layer:
+            for movie, star in graph.costars(person):
+                if star not in depth:
+                    depth[star] = depth[person] + 1
+                    parents[star] = [(movie, person)]
+                    next_layer.append(star)
+                elif depth[star] == depth[person] + 1:
+                    parents[star].append((movie, person))
+        layer = next_layer
+
+    if goal not in depth:
+        return
+
+    # Walk the DAG back from the target, one path at a time
+    def paths():
+        stack = [(goal, [])]
+        while stack:
+            person, pairs = stack.pop()
+            if person == start:
+                yield [(graph.movie_ids[movie], graph.person_ids[star])
+                       for movie, star in reversed(pairs)]
+                continue
+            for movie, parent in reversed(parents[person]):
+                stack.append((parent, pairs + [(movie, person)]))
+
+    yield from itertools.islice(paths(), limit)
+
 
 def person_id_for_name(name):
     """
     Returns the IMDB id for a person's name,
     resolving ambiguities as needed.
     """
-    person_ids = list(names.get(name.lower(), set()))
+    person_ids = name_index.exact(name)
     if len(person_ids) == 0:
-        return None
+        # Offer the closest names instead of giving up straight away
+        person_ids = person_ids_for_name(name, limit=5)
+        if len(person_ids) == 0:
+            return None
+        print(f"No exact match for '{name}'. Did you mean:")
     elif len(person_ids) > 1:
         print(f"Which '{name}'?")
-        for person_id in person_ids:
-            person = people[person_id]
-            name = person["name"]
-            birth = person["birth"]
-            print(f"ID: {person_id}, Name: {name}, Birth: {birth}")
-        try:
-            person_id = input("Intended Person ID: ")
-            if person_id in person_ids:
-                return person_id
-        except ValueError:
-            pass
-        return None
     else:
         return person_ids[0]
 
+    for person_id in person_ids:
+        person = people[person_id]
+        name = person["name"]
+        birth = person["birth"]
+        print(f"ID: {person_id}, Name: {name}, Birth: {birth}")
+    try:
+        person_id = input("Intended Person ID: ")
+        if person_id in person_ids:
+            return person_id
+    except ValueError:
+        pass
+    return None
+
+
+def person_ids_for_name(name, limit=10):
+    """
+    Returns up to limit person_ids ranked for a possibly partial or
+    misspelled name, without prompting: exact matches first, then
+    prefix matches, then similar names.
+    """
+    return name_index.search(name, limit)
+
 
 def neighbors_for_person(person_id):
     """
     Returns (movie_id, person_id) pairs for people
     who starred with a given person.
     """
-    movie_ids = people[person_id]["movies"]
-    neighbors = set()
-    for movie_id in movie_ids:
-        for person_id in movies[movie_id]["stars"]:
-            neighbors.add((movie_id, person_id))
+    neighbors = neighbor_cache.get(person_id)
+    if neighbors is not None:
+        return neighbors
+
+    person_ids = graph.person_ids
+    movie_ids = graph.movie_ids
+    neighbors = frozenset(
+        (movie_ids[movie], person_ids[person])
+        for movie, person in graph.costars(people.index(person_id))
+    )
+    neighbor_cache.put(person_id, neighbors)
     return neighbors
 
 
+def costars_for_person(person_id):
+    """
+    Yields one (movie_id, person_id) pair per distinct person who
+    starred with a given person, without building the full pair set.
+    """
+    person = people.index(person_id)
+    seen = {person}
+    for movie, star in graph.costars(person):
+        if star not in seen:
+            seen.add(star)
+            yield graph.movie_ids[movie], graph.person_ids[star]
+
+
+def neighbors_size(neighbors):
+    """
+    Estimates the bytes held by a neighbors_for_person result.
+    """
+    return sys.getsizeof(neighbors) + len(neighbors) * sys.getsizeof((None, None))
+
+
+def configure_neighbor_cache(max_entries=4096, max_bytes=None):
+    """
+    Replaces the neighbors_for_person cache with an empty one bounded by
+    max_entries and/or max_bytes (None for no bound on that measure).
+    """
+    global neighbor_cache
+    neighbor_cache = LRUCache(max_entries, max_bytes, sizeof=neighbors_size)
+
 if __name__ == "__main__":
     main()
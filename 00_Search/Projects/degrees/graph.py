@@ -0,0 +1,241 @@
+import bisect
+from array import array
+
+
+class StringColumn():
+    """
+    Sequence of strings packed into one UTF-8 blob: string i is
+    data[offsets[i]:offsets[i + 1]]. Costs a few bytes per string
+    instead of a str object each, and can be memory-mapped as is.
+    """
+
+    def __init__(self, offsets=None, data=None):
+        self.offsets = array("q", [0]) if offsets is None else offsets
+        self.data = bytearray() if data is None else data
+
+    def append(self, value):
+        self.data += value.encode("utf-8")
+        self.offsets.append(len(self.data))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        return str(self.data[self.offsets[i]:self.offsets[i + 1]], "utf-8")
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+def sorted_order(column, key=None):
+    """
+    Returns the indices of a column sorted by value (or by key(value)).
+    """
+    if key is None:
+        return array("q", sorted(range(len(column)), key=column.__getitem__))
+    return array("q", sorted(range(len(column)), key=lambda i: key(column[i])))
+
+
+class Records():
+    """
+    Read-only mapping from an IMDB id to a dict of its fields, such as
+    people["102"] == {"name": "Kevin Bacon", "birth": "1958"}.
+
+    Ids and fields are StringColumns indexed by the dense index of each
+    record, and an id is found by bisection over order, the indices
+    sorted by id, so there is no per-record dict.
+    """
+
+    def __init__(self, ids, order, fields):
+        self.ids = ids
+        self.order = order
+        self.fields = fields
+
+    def index(self, key):
+        """
+        Returns the dense index of an id. Raises KeyError if unknown.
+        """
+        position = bisect.bisect_left(self.order, key, key=self.ids.__getitem__)
+        if position < len(self.order) and self.ids[self.order[position]] == key:
+            return self.order[position]
+        raise KeyError(key)
+
+    def record(self, index):
+        return {name: column[index] for name, column in self.fields.items()}
+
+    def __getitem__(self, key):
+        return self.record(self.index(key))
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        try:
+            self.index(key)
+        except KeyError:
+            return False
+        return True
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        return iter(self.ids)
+
+
+class Graph():
+    """
+    Bipartite person <-> movie graph in compressed sparse row (CSR) form.
+
+    IMDB ids are interned to dense integer indices. The movies of person p
+    are person_movies[person_offsets[p]:person_offsets[p + 1]] and the stars
+    of movie m are movie_stars[movie_offsets[m]:movie_offsets[m + 1]].
+    people and movies are the Records of each index.
+    """
+
+    def __init__(self, people, movies,
+                 person_offsets, person_movies, movie_offsets, movie_stars):
+        self.people = people
+        self.movies = movies
+        self.person_ids = people.ids
+        self.movie_ids = movies.ids
+        self.person_offsets = person_offsets
+        self.person_movies = person_movies
+        self.movie_offsets = movie_offsets
+        self.movie_stars = movie_stars
+
+    def movies_of(self, person):
+        """
+        Returns the movie indices a person index starred in.
+        """
+        return self.person_movies[self.person_offsets[person]:self.person_offsets[person + 1]]
+
+    def stars_of(self, movie):
+        """
+        Returns the person indices that starred in a movie index.
+        """
+        return self.movie_stars[self.movie_offsets[movie]:self.movie_offsets[movie + 1]]
+
+    def costars(self, person):
+        """
+        Yields (movie, person) index pairs for everyone who starred
+        with a given person index, the person included.
+        """
+        movie_stars = self.movie_stars
+        movie_offsets = self.movie_offsets
+        for movie in self.movies_of(person):
+            for star in movie_stars[movie_offsets[movie]:movie_offsets[movie + 1]]:
+                yield movie, star
+
+
+class GraphBuilder():
+    """
+    Collects people, movies and star edges, then packs them into a Graph.
+    """
+
+    def __init__(self):
+        self.person_ids = StringColumn()
+        self.person_names = StringColumn()
+        self.person_births = StringColumn()
+        self.movie_ids = StringColumn()
+        self.movie_titles = StringColumn()
+        self.movie_years = StringColumn()
+
+        # Only needed to resolve star rows while loading
+        self.person_index = {}
+        self.movie_index = {}
+
+        self.edge_people = array("q")
+        self.edge_movies = array("q")
+
+    def add_person(self, person_id, name, birth):
+        if person_id not in self.person_index:
+            self.person_index[person_id] = len(self.person_ids)
+            self.person_ids.append(person_id)
+            self.person_names.append(name)
+            self.person_births.append(birth)
+
+    def add_movie(self, movie_id, title, year):
+        if movie_id not in self.movie_index:
+            self.movie_index[movie_id] = len(self.movie_ids)
+            self.movie_ids.append(movie_id)
+            self.movie_titles.append(title)
+            self.movie_years.append(year)
+
+    def add_star(self, person_id, movie_id):
+        """
+        Records that a person starred in a movie.
+        Returns False if either id is unknown.
+        """
+        person = self.person_index.get(person_id)
+        movie = self.movie_index.get(movie_id)
+        if person is None or movie is None:
+            return False
+        self.edge_people.append(person)
+        self.edge_movies.append(movie)
+        return True
+
+    def build(self):
+        num_people = len(self.person_ids)
+        num_movies = len(self.movie_ids)
+        self.person_index = {}
+        self.movie_index = {}
+
+        # Counting sort of the edges by person: count each row, turn the
+        # counts into offsets, then drop every movie into its row
+        person_offsets = array("q", [0]) * (num_people + 1)
+        for person in self.edge_people:
+            person_offsets[person + 1] += 1
+        for i in range(num_people):
+            person_offsets[i + 1] += person_offsets[i]
+
+        person_movies = array("q", [0]) * len(self.edge_people)
+        cursor = person_offsets[:-1]
+        for person, movie in zip(self.edge_people, self.edge_movies):
+            person_movies[cursor[person]] = movie
+            cursor[person] += 1
+        del cursor
+        self.edge_people = array("q")
+        self.edge_movies = array("q")
+
+        # Sort each row and drop duplicate star rows, compacting in place
+        end = 0
+        for person in range(num_people):
+            start, stop = person_offsets[person], person_offsets[person + 1]
+            person_offsets[person] = end
+            if stop - start > 1:
+                row = sorted(set(person_movies[start:stop]))
+                person_movies[end:end + len(row)] = array("q", row)
+                end += len(row)
+            elif stop > start:
+                person_movies[end] = person_movies[start]
+                end += 1
+        person_offsets[num_people] = end
+        del person_movies[end:]
+
+        # Transpose person -> movie rows into movie -> person rows
+        movie_offsets = array("q", [0]) * (num_movies + 1)
+        for movie in person_movies:
+            movie_offsets[movie + 1] += 1
+        for i in range(num_movies):
+            movie_offsets[i + 1] += movie_offsets[i]
+
+        movie_stars = array("q", [0]) * len(person_movies)
+        cursor = movie_offsets[:-1]
+        for person in range(num_people):
+            for i in range(person_offsets[person], person_offsets[person + 1]):
+                movie = person_movies[i]
+                movie_stars[cursor[movie]] = person
+                cursor[movie] += 1
+
+        people = Records(self.person_ids, sorted_order(self.person_ids),
+                         {"name": self.person_names, "birth": self.person_births})
+        movies = Records(self.movie_ids, sorted_order(self.movie_ids),
+                         {"title": self.movie_titles, "year": self.movie_years})
+        return Graph(people, movies, person_offsets, person_movies, movie_offsets, movie_stars)
@@ -0,0 +1,146 @@
+"""
+Chunked CSV ingestion for the degrees dataset.
+
+Each CSV file is split into byte ranges aligned on line boundaries and
+the ranges are parsed independently, either in-process or in a pool of
+worker processes, so no file is ever read into memory as a whole.
+Fields must not contain embedded newlines, which holds for the IMDB
+exports this project uses.
+"""
+
+import csv
+import io
+import multiprocessing
+import os
+import time
+
+# Columns kept from each file, in the order rows are yielded
+COLUMNS = {
+    "people": ("id", "name", "birth"),
+    "movies": ("id", "title", "year"),
+    "stars": ("person_id", "movie_id")
+}
+
+
+class LoadReport():
+    """
+    Row, dropped-row and timing counts for one load. rows only counts
+    accepted rows, so a row is counted in rows or in dropped, never both.
+    """
+
+    def __init__(self):
+        self.rows = {kind: 0 for kind in COLUMNS}
+        self.dropped = {kind: 0 for kind in COLUMNS}
+        self.seconds = 0.0
+
+    def rows_per_second(self):
+        total = sum(self.rows.values())
+        return total / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        counts = ", ".join(
+            f"{kind}: {self.rows[kind]} rows ({self.dropped[kind]} dropped)"
+            for kind in COLUMNS
+        )
+        return f"{counts}; {self.seconds:.2f}s, {self.rows_per_second():.0f} rows/s"
+
+
+def chunk_ranges(kind, path, chunk_size):
+    """
+    Returns (kind, path, columns, start, end) tasks covering the data
+    rows of a CSV file in ranges of roughly chunk_size bytes.
+    """
+    with open(path, "rb") as f:
+        header = next(csv.reader([f.readline().decode("utf-8-sig")]))
+        try:
+            columns = [header.index(name) for name in COLUMNS[kind]]
+        except ValueError:
+            raise Exception(f"{path} must have columns {', '.join(COLUMNS[kind])}")
+
+        tasks = []
+        start = f.tell()
+        size = os.fstat(f.fileno()).st_size
+        while start < size:
+            f.seek(min(start + chunk_size, size))
+            f.readline()
+            end = f.tell()
+            tasks.append((kind, path, columns, start, end))
+            start = end
+    return tasks
+
+
+def parse_chunk(task):
+    """
+    Parses one byte range of a CSV file.
+    Returns (kind, rows, dropped) where rows are tuples of the kept columns.
+    """
+    kind, path, columns, start, end = task
+    with open(path, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode("utf-8")
+
+    rows = []
+    dropped = 0
+    width = max(columns) + 1
+    for row in csv.reader(io.StringIO(text, newline="")):
+        if len(row) < width:
+            if row:
+                dropped += 1
+            continue
+        rows.append(tuple(row[i] for i in columns))
+    return kind, rows, dropped
+
+
+def stream_rows(directory, report, workers=0, chunk_size=1 << 20):
+    """
+    Yields (kind, rows) batches for people, then movies, then stars.
+
+    With workers > 0 the chunks are parsed in that many processes and
+    people/movies chunks are interleaved so both files parse at once.
+    At most 2 * workers parsed chunks are held at a time.
+    """
+    start = time.perf_counter()
+    people = chunk_ranges("people", os.path.join(directory, "people.csv"), chunk_size)
+    movies = chunk_ranges("movies", os.path.join(directory, "movies.csv"), chunk_size)
+    stars = chunk_ranges("stars", os.path.join(directory, "stars.csv"), chunk_size)
+
+    # Stars are only merged once every person and movie is known, so they
+    # come last; the first star chunks overlap the tail of the other files
+    tasks = [task for pair in zip(people, movies) for task in pair]
+    tasks += people[len(movies):] + movies[len(people):] + stars
+
+    if workers > 0:
+        pool = multiprocessing.Pool(workers)
+        results = bounded_imap(pool, parse_chunk, tasks, 2 * workers)
+    else:
+        pool = None
+        results = map(parse_chunk, tasks)
+
+    try:
+        for kind, rows, dropped in results:
+            report.rows[kind] += len(rows)
+            report.dropped[kind] += dropped
+            yield kind, rows
+    finally:
+        if pool is not None:
+            pool.terminate()
+        report.seconds = time.perf_counter() - start
+
+
+def bounded_imap(pool, function, tasks, window):
+    """
+    Like pool.imap, but keeps at most window tasks submitted ahead of
+    the consumer so parsed results cannot pile up in memory.
+    """
+    pending = []
+    tasks = iter(tasks)
+    for task in tasks:
+        pending.append(pool.apply_async(function, (task,)))
+        if len(pending) >= window:
+            break
+    while pending:
+        result = pending.pop(0).get()
+        for task in tasks:
+            pending.append(pool.apply_async(function, (task,)))
+            break
+        yield result
@@ -0,0 +1,176 @@
+import bisect
+from array import array
+from collections import Counter
+
+from graph import StringColumn
+
+
+def trigrams(name):
+    """
+    Returns the set of character trigrams of a name, padded so that
+    the start and end of the name count as well.
+    """
+    padded = f"  {name} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex():
+    """
+    Exact, prefix and fuzzy lookup over the lowercase names of the dataset.
+
+    The distinct lowercase names are kept sorted in keys, so a name or a
+    prefix is a contiguous range found by bisection, and the people of
+    key k are key_people[key_offsets[k]:key_offsets[k + 1]]. Likewise the
+    trigrams are sorted in grams and the keys containing gram g are
+    gram_keys[gram_offsets[g]:gram_offsets[g + 1]], so that misspelled
+    queries can be ranked by trigram overlap. Everything is built up
+    front by build, and can be memory-mapped from a snapshot.
+    """
+
+    def __init__(self, person_ids, keys, key_offsets, key_people,
+                 grams, gram_offsets, gram_keys):
+        self.person_ids = person_ids
+        self.keys = keys
+        self.key_offsets = key_offsets
+        self.key_people = key_people
+        self.grams = grams
+        self.gram_offsets = gram_offsets
+        self.gram_keys = gram_keys
+
+    def ids(self, position):
+        """
+        Returns the sorted person_ids of the key at position.
+        """
+        people = self.key_people[self.key_offsets[position]:self.key_offsets[position + 1]]
+        return sorted(self.person_ids[person] for person in people)
+
+    def exact(self, name):
+        """
+        Returns the sorted person_ids whose name is name, ignoring case.
+        """
+        key = name.lower()
+        position = bisect.bisect_left(self.keys, key)
+        if position < len(self.keys) and self.keys[position] == key:
+            return self.ids(position)
+        return []
+
+    def postings(self, gram):
+        """
+        Returns the positions of the keys containing a trigram.
+        """
+        position = bisect.bisect_left(self.grams, gram)
+        if position < len(self.grams) and self.grams[position] == gram:
+            return self.gram_keys[self.gram_offsets[position]:self.gram_offsets[position + 1]]
+        return ()
+
+    def prefix(self, prefix, limit=None):
+        """
+        Returns positions of names starting with prefix, in name order.
+        """
+        prefix = prefix.lower()
+        positions = []
+        position = bisect.bisect_left(self.keys, prefix)
+        while position < len(self.keys) and self.keys[position].startswith(prefix):
+            if limit is not None and len(positions) >= limit:
+                break
+            positions.append(position)
+            position += 1
+        return positions
+
+    def similar(self, name, limit=10, threshold=0.3):
+        """
+        Returns (score, position) pairs for the names most similar to
+        name by trigram Dice coefficient, best first.
+        """
+        grams = trigrams(name.lower())
+
+        # Count overlaps over the rarer half of the query trigrams only:
+        # common trigrams have huge postings but say little about
+        # similarity. Trigrams no name has (typically the misspelled
+        # ones) are left out first, or they would fill the half with
+        # nothing. The best partial matches are then scored exactly.
+        postings = {gram: self.postings(gram) for gram in grams}
+        rarest = sorted((gram for gram in grams if postings[gram]),
+                        key=lambda gram: len(postings[gram]))
+        shared = Counter()
+        for gram in rarest[:max(2, len(rarest) // 2)]:
+            shared.update(postings[gram])
+
+        scored = []
+        for position, _ in shared.most_common(limit * 10):
+            key_grams = trigrams(self.keys[position])
+            score = 2 * len(grams & key_grams) / (len(grams) + len(key_grams))
+            if score >= threshold:
+                scored.append((score, position))
+        scored.sort(key=lambda item: (-item[0], self.keys[item[1]]))
+        return scored[:limit]
+
+    def search(self, name, limit=10):
+        """
+        Returns up to limit person_ids ranked for a query: exact name
+        matches first, then names starting with the query, then
+        names similar to it.
+        """
+        query = name.lower().strip()
+        if not query:
+            return []
+
+        positions = self.prefix(query, limit)
+        if len(positions) < limit:
+            positions += [position for _, position in self.similar(query, limit)]
+
+        results = []
+        seen = set()
+        for position in positions:
+            for person_id in self.ids(position):
+                if person_id not in seen:
+                    seen.add(person_id)
+                    results.append(person_id)
+                if len(results) >= limit:
+                    return results
+        return results
+
+
+def build(person_ids, names):
+    """
+    Returns the NameIndex of people whose names are given by a column
+    indexed like person_ids.
+    """
+    lowered = [name.lower() for name in names]
+    key_people = array("q", sorted(range(len(lowered)), key=lowered.__getitem__))
+    distinct = []
+    key_offsets = array("q", [0])
+    for i, person in enumerate(key_people):
+        key = lowered[person]
+        if not distinct or distinct[-1] != key:
+            if distinct:
+                key_offsets.append(i)
+            distinct.append(key)
+    if distinct:
+        key_offsets.append(len(key_people))
+    del lowered
+
+    # Positions fit in 32 bits and the postings are the bulk of the index
+    postings = {}
+    for position, key in enumerate(distinct):
+        for gram in trigrams(key):
+            positions = postings.get(gram)
+            if positions is None:
+                positions = postings[gram] = array("i")
+            positions.append(position)
+
+    keys = StringColumn()
+    for key in distinct:
+        keys.append(key)
+    del distinct
+
+    grams = StringColumn()
+    gram_offsets = array("q", [0])
+    gram_keys = array("i")
+    for gram in sorted(postings):
+        grams.append(gram)
+        gram_keys += postings.pop(gram)
+        gram_offsets.append(len(gram_keys))
+
+    return NameIndex(person_ids, keys, key_offsets, key_people,
+                     grams, gram_offsets, gram_keys)
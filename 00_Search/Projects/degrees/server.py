@@ -0,0 +1,147 @@
+"""
+Long-lived query mode for degrees.py.
+
+Loads the graph once, then answers shortest-path queries given as JSON
+lines, either on stdin or over a local TCP socket:
+
+    {"id": 1, "source": "Tom Hanks", "target": "Kevin Bacon"}
+
+Each answer is one JSON line with the path as [movie_id, person_id]
+pairs (null if not connected) and the query latency in milliseconds.
+Adding "paths": N to a query also returns up to N equally short paths.
+
+Searches are CPU-bound pure Python, so concurrent queries run in forked
+processes that share the loaded graph copy-on-write: a pool of --workers
+processes for stdin, and one process per connection for the socket.
+"""
+
+import argparse
+import json
+import socketserver
+import sys
+import time
+from collections import deque
+
+import degrees
+
+
+def resolve(value):
+    """
+    Returns the person_id for a person_id or an unambiguous name.
+    Raises ValueError otherwise.
+    """
+    if value in degrees.people:
+        return value
+    person_ids = degrees.name_index.exact(value)
+    if len(person_ids) == 1:
+        return person_ids[0]
+    if len(person_ids) > 1:
+        raise ValueError(f"ambiguous name: {value!r} ({', '.join(person_ids)})")
+    suggestions = degrees.person_ids_for_name(value, limit=5)
+    if suggestions:
+        raise ValueError(f"person not found: {value!r} (did you mean {', '.join(suggestions)}?)")
+    raise ValueError(f"person not found: {value!r}")
+
+
+def answer(line, bidirectional=True):
+    """
+    Answers one JSON query line, returning the JSON response line.
+    """
+    start = time.perf_counter()
+    response = {}
+    try:
+        query = json.loads(line)
+        if "id" in query:
+            response["id"] = query["id"]
+        source = resolve(str(query["source"]))
+        target = resolve(str(query["target"]))
+        path = degrees.shortest_path(source, target, bidirectional=bidirectional)
+        response["path"] = path
+        response["degrees"] = None if path is None else len(path)
+        if "paths" in query:
+            response["paths"] = list(degrees.shortest_paths(source, target, int(query["paths"])))
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        response["error"] = str(e)
+    response["latency_ms"] = round((time.perf_counter() - start) * 1000, 3)
+    return json.dumps(response)
+
+
+def serve_stdin(workers, bidirectional, directory):
+    """
+    Answers queries from stdin in order, using up to workers processes.
+    """
+    if workers <= 1:
+        for line in sys.stdin:
+            if line.strip():
+                print(answer(line, bidirectional), flush=True)
+        return
+
+    context, initializer, initargs = degrees.pool_context(directory)
+
+    # Keep a bounded window of in-flight queries so output stays in
+    # input order and memory does not grow with the input
+    pending = deque()
+    with context.Pool(workers, initializer, initargs) as pool:
+        for line in sys.stdin:
+            if not line.strip():
+                continue
+            pending.append(pool.apply_async(answer, (line, bidirectional)))
+            while pending and (len(pending) > 2 * workers or pending[0].ready()):
+                print(pending.popleft().get(), flush=True)
+        while pending:
+            print(pending.popleft().get(), flush=True)
+
+
+class QueryHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        for line in self.rfile:
+            line = line.decode("utf-8")
+            if line.strip():
+                response = answer(line, self.server.bidirectional)
+                self.wfile.write(response.encode("utf-8") + b"\n")
+
+
+# Where fork is unavailable connections fall back to threads
+if hasattr(socketserver, "ForkingTCPServer"):
+    TCPServer = socketserver.ForkingTCPServer
+else:
+    TCPServer = socketserver.ThreadingTCPServer
+
+
+class QueryServer(TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Answer degrees queries from JSON lines.")
+    parser.add_argument("directory", nargs="?", default="large")
+    parser.add_argument("--port", type=int,
+                        help="listen on localhost:PORT instead of reading stdin")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes answering queries from stdin")
+    parser.add_argument("--load-workers", type=int, default=0,
+                        help="processes used to parse the CSV files")
+    parser.add_argument("--unidirectional", action="store_true",
+                        help="use the one-sided breadth-first search")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    report = degrees.load_data(args.directory, workers=args.load_workers)
+    print(f"Data loaded in {time.perf_counter() - start:.2f}s.", file=sys.stderr)
+    if report is not None:
+        print(report, file=sys.stderr)
+
+    bidirectional = not args.unidirectional
+    if args.port is None:
+        serve_stdin(args.workers, bidirectional, args.directory)
+    else:
+        with QueryServer(("127.0.0.1", args.port), QueryHandler) as server:
+            server.bidirectional = bidirectional
+            print(f"Listening on 127.0.0.1:{args.port}", file=sys.stderr)
+            server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+import mmap
+import os
+import pickle
+import struct
+import sys
+
+from graph import Graph, Records, StringColumn
+from nameindex import NameIndex
+
+# Bump whenever the layout below changes so stale snapshots are rebuilt
+VERSION = 4
+MAGIC = b"DEGSNAP\0"
+HEADER = struct.Struct("<IQ")
+
+SNAPSHOT_NAME = "degrees.snapshot"
+SOURCES = ["people.csv", "movies.csv", "stars.csv"]
+
+# Fields of the people and movies Records, in storage order
+FIELDS = {"people": ["name", "birth"], "movies": ["title", "year"]}
+
+
+def source_stamp(directory):
+    """
+    Returns a value identifying the current state of the CSV files,
+    so that a snapshot is invalidated when any of them changes.
+    """
+    stamp = [sys.byteorder]
+    for name in SOURCES:
+        stat = os.stat(os.path.join(directory, name))
+        stamp.append((name, stat.st_size, stat.st_mtime_ns))
+    return stamp
+
+
+def dataset_arrays(graph, name_index):
+    """
+    Returns (name, array) pairs for every array a snapshot stores.
+    A StringColumn is stored as its offsets and its data blob.
+    """
+    arrays = []
+
+    def add_column(name, column):
+        arrays.append((f"{name}.offsets", column.offsets))
+        arrays.append((f"{name}.data", column.data))
+
+    for kind, records in (("people", graph.people), ("movies", graph.movies)):
+        add_column(f"{kind}.ids", records.ids)
+        arrays.append((f"{kind}.order", records.order))
+        for field in FIELDS[kind]:
+            add_column(f"{kind}.{field}", records.fields[field])
+
+    arrays += [
+        ("person_offsets", graph.person_offsets),
+        ("person_movies", graph.person_movies),
+        ("movie_offsets", graph.movie_offsets),
+        ("movie_stars", graph.movie_stars)
+    ]
+
+    add_column("names.keys", name_index.keys)
+    arrays.append(("names.key_offsets", name_index.key_offsets))
+    arrays.append(("names.key_people", name_index.key_people))
+    add_column("names.grams", name_index.grams)
+    arrays.append(("names.gram_offsets", name_index.gram_offsets))
+    arrays.append(("names.gram_keys", name_index.gram_keys))
+    return arrays
+
+
+def write_snapshot(directory, graph, name_index):
+    """
+    Writes the loaded dataset to a binary snapshot in directory.
+
+    Layout: magic, (version, metadata length), pickled metadata, padding
+    to 8 bytes, then every array of dataset_arrays as raw native values,
+    each padded to 8 bytes. The metadata only holds the source stamp and
+    the (name, typecode, size in bytes) of each array.
+    """
+    arrays = dataset_arrays(graph, name_index)
+    layout = []
+    for name, values in arrays:
+        view = memoryview(values)
+        layout.append((name, view.format, view.nbytes))
+    meta = pickle.dumps({
+        "stamp": source_stamp(directory),
+        "layout": layout
+    }, protocol=pickle.HIGHEST_PROTOCOL)
+
+    path = os.path.join(directory, SNAPSHOT_NAME)
+    temp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp, "wb") as f:
+            f.write(MAGIC)
+            f.write(HEADER.pack(VERSION, len(meta)))
+            f.write(meta)
+            f.write(b"\0" * (-f.tell() % 8))
+            for _, values in arrays:
+                f.write(values)
+                f.write(b"\0" * (-f.tell() % 8))
+        os.replace(temp, path)
+    except OSError:
+        # A read-only dataset directory just means no cache
+        if os.path.exists(temp):
+            os.remove(temp)
+
+
+def read_snapshot(directory):
+    """
+    Memory-maps the snapshot in directory and returns
+    (graph, name_index), or None if it is missing or stale.
+    """
+    path = os.path.join(directory, SNAPSHOT_NAME)
+    try:
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    start = len(MAGIC) + HEADER.size
+    if len(data) < start or data[:len(MAGIC)] != MAGIC:
+        return None
+    version, meta_length = HEADER.unpack_from(data, len(MAGIC))
+    if version != VERSION:
+        return None
+
+    meta = pickle.loads(data[start:start + meta_length])
+    if meta["stamp"] != source_stamp(directory):
+        return None
+
+    # Every array stays on disk and is paged in on demand
+    view = memoryview(data)
+    offset = start + meta_length
+    offset += -offset % 8
+    arrays = {}
+    for name, typecode, size in meta["layout"]:
+        arrays[name] = view[offset:offset + size].cast(typecode)
+        offset += size + -size % 8
+
+    def column(name):
+        return StringColumn(arrays[f"{name}.offsets"], arrays[f"{name}.data"])
+
+    records = {}
+    for kind, fields in FIELDS.items():
+        records[kind] = Records(
+            column(f"{kind}.ids"), arrays[f"{kind}.order"],
+            {field: column(f"{kind}.{field}") for field in fields}
+        )
+
+    graph = Graph(records["people"], records["movies"],
+                  arrays["person_offsets"], arrays["person_movies"],
+                  arrays["movie_offsets"], arrays["movie_stars"])
+    name_index = NameIndex(graph.person_ids, column("names.keys"),
+                           arrays["names.key_offsets"], arrays["names.key_people"],
+                           column("names.grams"),
+                           arrays["names.gram_offsets"], arrays["names.gram_keys"])
+    return graph, name_index
@@ -0,0 +1,151 @@
+"""
+Sampled graph statistics for the degrees dataset.
+
+Runs full breadth-first sweeps from randomly chosen people in parallel
+worker processes and aggregates the distribution of degrees of
+separation, average path length and eccentricities, plus the exact
+connected component sizes.
+"""
+
+import argparse
+import json
+import random
+import time
+from array import array
+from collections import Counter
+
+import degrees
+
+
+def sweep(source):
+    """
+    Breadth-first sweep from a person index over the loaded graph.
+    Returns (distance histogram, eccentricity) for the people reached.
+    """
+    graph = degrees.graph
+    seen = bytearray(len(graph.person_ids))
+    movie_seen = bytearray(len(graph.movie_ids))
+    seen[source] = 1
+    histogram = Counter()
+    layer = [source]
+    distance = 0
+
+    while layer:
+        distance += 1
+        next_layer = []
+        for person in layer:
+            for movie in graph.movies_of(person):
+                # Every star of a movie is reached the first time the
+                # movie is, so each movie row is scanned only once
+                if movie_seen[movie]:
+                    continue
+                movie_seen[movie] = 1
+                for star in graph.stars_of(movie):
+                    if not seen[star]:
+                        seen[star] = 1
+                        next_layer.append(star)
+        if next_layer:
+            histogram[distance] = len(next_layer)
+        layer = next_layer
+
+    return histogram, max(histogram, default=0)
+
+
+def component_sizes():
+    """
+    Returns a Counter mapping component size to number of components.
+    """
+    graph = degrees.graph
+    component = array("l", [-1]) * len(graph.person_ids)
+    movie_seen = bytearray(len(graph.movie_ids))
+    sizes = Counter()
+
+    for root in range(len(graph.person_ids)):
+        if component[root] >= 0:
+            continue
+        component[root] = root
+        stack = [root]
+        size = 0
+        while stack:
+            person = stack.pop()
+            size += 1
+            for movie in graph.movies_of(person):
+                if movie_seen[movie]:
+                    continue
+                movie_seen[movie] = 1
+                for star in graph.stars_of(movie):
+                    if component[star] < 0:
+                        component[star] = root
+                        stack.append(star)
+        sizes[size] += 1
+
+    return sizes
+
+
+def sample(directory, samples, seed=0, workers=None):
+    """
+    Runs samples sweeps from sources drawn with the given seed and
+    returns the aggregated statistics as a dictionary.
+
+    The sources depend only on seed, so results are identical for any
+    number of workers. Requires degrees.load_data(directory) first.
+    """
+    num_people = len(degrees.graph.person_ids)
+    rng = random.Random(seed)
+    sources = [rng.randrange(num_people) for _ in range(min(samples, num_people))]
+
+    context, initializer, initargs = degrees.pool_context(directory)
+
+    separation = Counter()
+    eccentricity = Counter()
+    with context.Pool(workers, initializer, initargs) as pool:
+        for histogram, radius in pool.imap_unordered(sweep, sources, chunksize=4):
+            separation.update(histogram)
+            eccentricity[radius] += 1
+
+    paths = sum(separation.values())
+    total = sum(distance * count for distance, count in separation.items())
+    return {
+        "samples": len(sources),
+        "seed": seed,
+        "separation": dict(sorted(separation.items())),
+        "average_path_length": total / paths if paths else None,
+        "eccentricity": dict(sorted(eccentricity.items())),
+        "components": dict(sorted(component_sizes().items(), reverse=True))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sample degrees-of-separation statistics.")
+    parser.add_argument("directory", nargs="?", default="large")
+    parser.add_argument("--samples", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--json", action="store_true", help="print the raw statistics as JSON")
+    args = parser.parse_args()
+
+    degrees.load_data(args.directory)
+    start = time.perf_counter()
+    stats = sample(args.directory, args.samples, args.seed, args.workers)
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        print(json.dumps(stats))
+        return
+
+    print(f"{stats['samples']} sweeps in {elapsed:.2f}s (seed {stats['seed']})")
+    print("Degrees of separation:")
+    for distance, count in stats["separation"].items():
+        print(f"  {distance}: {count}")
+    if stats["average_path_length"] is not None:
+        print(f"Average path length: {stats['average_path_length']:.3f}")
+    print("Eccentricity:")
+    for radius, count in stats["eccentricity"].items():
+        print(f"  {radius}: {count}")
+    print("Component sizes (size: count):")
+    for size, count in list(stats["components"].items())[:10]:
+        print(f"  {size}: {count}")
+
+
+if __name__ == "__main__":
+    main()
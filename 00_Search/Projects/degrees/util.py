@@ -1,3 +1,8 @@
+import sys
+import threading
+from collections import OrderedDict, deque
+
+
 class Node():
     def __init__(self, state, parent, action):
         self.state = state
@@ -36,3 +41,131 @@ class QueueFrontier(StackFrontier):
             node = self.frontier[0]
             self.frontier = self.frontier[1:]
             return node
+
+
+class IndexedStackFrontier():
+    """
+    Drop-in StackFrontier with O(1) add, remove and contains_state.
+
+    Nodes live in a deque and a state -> node dict mirrors its contents,
+    assuming (as the solvers do) at most one node per state at a time.
+    """
+
+    def __init__(self):
+        self.frontier = deque()
+        self.states = {}
+
+    def add(self, node):
+        self.frontier.append(node)
+        self.states[node.state] = node
+
+    def contains_state(self, state):
+        return state in self.states
+
+    def empty(self):
+        return len(self.frontier) == 0
+
+    def __len__(self):
+        return len(self.frontier)
+
+    def _pop(self):
+        return self.frontier.pop()
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        else:
+            node = self._pop()
+            if self.states.get(node.state) is node:
+                del self.states[node.state]
+            return node
+
+
+class IndexedQueueFrontier(IndexedStackFrontier):
+
+    def _pop(self):
+        return self.frontier.popleft()
+
+
+class LRUCache():
+    """
+    Least-recently-used cache bounded by number of entries and/or by
+    an estimate of their size in bytes, with hit/miss counters.
+    """
+
+    def __init__(self, max_entries=None, max_bytes=None, sizeof=sys.getsizeof):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.entries = OrderedDict()
+        self.sizes = {}
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key, default=None):
+        with self.lock:
+            try:
+                value = self.entries[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        with self.lock:
+            if key in self.entries:
+                self.size_bytes -= self.sizes.pop(key)
+                del self.entries[key]
+            self.entries[key] = value
+            self.sizes[key] = size
+            self.size_bytes += size
+            while ((self.max_entries is not None and len(self.entries) > self.max_entries)
+                   or (self.max_bytes is not None and self.size_bytes > self.max_bytes)):
+                old, _ = self.entries.popitem(last=False)
+                self.size_bytes -= self.sizes.pop(old)
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.sizes.clear()
+            self.size_bytes = 0
+
+
+class SearchStats():
+    """
+    Optional instrumentation for a search loop.
+
+    Solvers take stats=None and only do this bookkeeping when an instance
+    is passed in. on_expand, if given, is called with each expanded state.
+    """
+
+    def __init__(self, on_expand=None):
+        self.expanded = 0
+        self.frontier_max = 0
+        self.neighbor_seconds = 0.0
+        self.membership_seconds = 0.0
+        self.on_expand = on_expand
+
+    def expand(self, state, frontier_size):
+        self.expanded += 1
+        if frontier_size > self.frontier_max:
+            self.frontier_max = frontier_size
+        if self.on_expand is not None:
+            self.on_expand(state)
+
+    def __str__(self):
+        return (f"expanded {self.expanded}, frontier max {self.frontier_max}, "
+                f"neighbors {self.neighbor_seconds:.4f}s, "
+                f"membership {self.membership_seconds:.4f}s")
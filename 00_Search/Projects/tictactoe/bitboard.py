@@ -0,0 +1,161 @@
+"""
+Tic Tac Toe engine on bitboards.
+
+A board is a pair (x, o) of 9-bit integers where bit i * 3 + j is set if
+that player has a mark on cell (i, j). Exposes the same functions as
+tictactoe.py, plus converters to and from its list-of-lists boards.
+"""
+
+import tictactoe as ttt
+
+X = ttt.X
+O = ttt.O
+EMPTY = ttt.EMPTY
+
+FULL = 0b111111111
+
+# Rows, columns and diagonals as bit masks
+WIN_MASKS = [
+    0b000000111, 0b000111000, 0b111000000,
+    0b001001001, 0b010010010, 0b100100100,
+    0b100010001, 0b001010100
+]
+
+# Minimax value of every (x, o) position searched so far
+values = {}
+
+
+def initial_state():
+    """
+    Returns starting state of the board.
+    """
+    return 0, 0
+
+
+def from_board(board):
+    """
+    Returns the bitboard of a list-of-lists board.
+    """
+    x = o = 0
+    for i in range(3):
+        for j in range(3):
+            if board[i][j] == X:
+                x |= 1 << (i * 3 + j)
+            elif board[i][j] == O:
+                o |= 1 << (i * 3 + j)
+    return x, o
+
+
+def to_board(bitboard):
+    """
+    Returns the list-of-lists board of a bitboard.
+    """
+    x, o = bitboard
+    return [
+        [X if x >> (i * 3 + j) & 1 else O if o >> (i * 3 + j) & 1 else EMPTY
+         for j in range(3)]
+        for i in range(3)
+    ]
+
+
+def player(bitboard):
+    """
+    Returns player who has the next turn on a board.
+    """
+    x, o = bitboard
+    return X if (x | o).bit_count() % 2 == 0 else O
+
+
+def actions(bitboard):
+    """
+    Returns set of all possible actions (i, j) available on the board,
+    empty once the game is over.
+    """
+    if terminal(bitboard):
+        return set()
+    x, o = bitboard
+    free = FULL & ~(x | o)
+    return {divmod(cell, 3) for cell in range(9) if free >> cell & 1}
+
+
+def result(bitboard, action):
+    """
+    Returns the board that results from making move (i, j) on the board.
+    """
+    i, j = action
+
+    if i > 2 or i < 0 or j > 2 or j < 0:
+        raise Exception("Out of bounds")
+
+    x, o = bitboard
+    bit = 1 << (i * 3 + j)
+    if (x | o) & bit:
+        raise Exception("Invalid Action")
+
+    if (x | o).bit_count() % 2 == 0:
+        return x | bit, o
+    return x, o | bit
+
+
+def winner(bitboard):
+    """
+    Returns the winner of the game, if there is one.
+    """
+    x, o = bitboard
+    for mask in WIN_MASKS:
+        if x & mask == mask:
+            return X
+        if o & mask == mask:
+            return O
+    return None
+
+
+def terminal(bitboard):
+    """
+    Returns True if game is over, False otherwise.
+    """
+    x, o = bitboard
+    return (x | o) == FULL or winner(bitboard) is not None
+
+
+def utility(bitboard):
+    """
+    Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
+    """
+    match winner(bitboard):
+        case "X":
+            return 1
+        case "O":
+            return -1
+        case _:
+            return 0
+
+
+def value(bitboard):
+    """
+    Returns the minimax value of a board, memoized in values.
+    """
+    if bitboard in values:
+        return values[bitboard]
+
+    if terminal(bitboard):
+        result_value = utility(bitboard)
+    elif player(bitboard) == X:
+        result_value = max(value(result(bitboard, action)) for action in actions(bitboard))
+    else:
+        result_value = min(value(result(bitboard, action)) for action in actions(bitboard))
+
+    values[bitboard] = result_value
+    return result_value
+
+
+def minimax(bitboard):
+    """
+    Returns the optimal action for the current player on the board.
+    """
+    if terminal(bitboard):
+        return None
+
+    # Maximize the value for X, minimize it for O
+    sign = 1 if player(bitboard) == X else -1
+    return max(actions(bitboard), key=lambda action: sign * value(result(bitboard, action)))
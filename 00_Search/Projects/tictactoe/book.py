@@ -0,0 +1,83 @@
+"""
+Writes the Tic Tac Toe opening book.
+
+Solves every position reachable from the empty board and stores its
+minimax value and best move in the file tictactoe.py memory-maps at
+import, so minimax answers with a lookup instead of a search.
+
+    python book.py [--output tictactoe.book]
+"""
+
+import argparse
+import os
+import time
+
+import tictactoe as ttt
+
+
+def best_action(board):
+    """
+    Returns the optimal action for the player to move, preferring moves
+    earlier in MOVE_ORDER among equally good ones.
+    """
+    sign = 1 if ttt.player(board) == ttt.X else -1
+    return max(
+        (action for action in ttt.MOVE_ORDER if action in ttt.actions(board)),
+        key=lambda action: sign * ttt.board_value(ttt.result(board, action))
+    )
+
+
+def solve():
+    """
+    Returns the book entries, one byte per board_index, for every
+    position reachable from the initial state.
+    """
+    entries = bytearray([ttt.NO_ENTRY]) * ttt.BOOK_SIZE
+    stack = [ttt.initial_state()]
+    while stack:
+        board = stack.pop()
+        index = ttt.board_index(board)
+        if entries[index] != ttt.NO_ENTRY:
+            continue
+
+        value = ttt.board_value(board) + 1
+        if ttt.terminal(board):
+            entries[index] = value << 4
+            continue
+        i, j = best_action(board)
+        entries[index] = value << 4 | (i * 3 + j + 1)
+        for action in ttt.actions(board):
+            stack.append(ttt.result(board, action))
+    return entries
+
+
+def write_book(entries, path=ttt.BOOK_NAME):
+    """
+    Writes the entries after the book header, replacing path atomically.
+    """
+    temp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp, "wb") as f:
+            f.write(ttt.BOOK_MAGIC)
+            f.write(entries)
+        os.replace(temp, path)
+    finally:
+        if os.path.exists(temp):
+            os.remove(temp)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write the Tic Tac Toe opening book.")
+    parser.add_argument("--output", default=ttt.BOOK_NAME)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    entries = solve()
+    write_book(entries, args.output)
+    positions = sum(entry != ttt.NO_ENTRY for entry in entries)
+    print(f"{positions} positions written to {args.output} "
+          f"in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
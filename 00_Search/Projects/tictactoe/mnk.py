@@ -0,0 +1,280 @@
+"""
+m,n,k-game engine: an m x n board where k in a row wins.
+
+Generalizes tictactoe.py (which is the 3,3,3 game) to larger boards such
+as 15,15,5 gomoku. The game keeps per-line counts up to date as moves are
+played and undone, so win detection around the last move and the
+evaluation function are both cheap, and the AI runs depth-limited
+alpha-beta search with iterative deepening under a time budget.
+"""
+
+import math
+import time
+
+X = "X"
+O = "O"
+EMPTY = None
+
+# Score of a won game, larger than any evaluation
+WIN = 10 ** 9
+
+
+class Timeout(Exception):
+    pass
+
+
+class Game():
+
+    def __init__(self, m=3, n=3, k=3):
+        if k > max(m, n):
+            raise Exception("k must fit on the board")
+        self.m = m
+        self.n = n
+        self.k = k
+        self.cells = [EMPTY] * (m * n)
+        self.moves = []
+        self.won = None
+
+        # Every line of k cells (a "window"), and for each cell the
+        # windows through it
+        self.windows = []
+        for i in range(m):
+            for j in range(n):
+                for di, dj in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_i, end_j = i + di * (k - 1), j + dj * (k - 1)
+                    if 0 <= end_i < m and 0 <= end_j < n:
+                        self.windows.append([(i + di * s) * n + j + dj * s for s in range(k)])
+        self.cell_windows = [[] for _ in range(m * n)]
+        for w, window in enumerate(self.windows):
+            for cell in window:
+                self.cell_windows[cell].append(w)
+
+        # Marks of each player in each window, and the evaluation
+        # (from X's point of view) kept in step with them
+        self.counts = {X: [0] * len(self.windows), O: [0] * len(self.windows)}
+        self.weights = [0] + [10 ** s for s in range(k)]
+        self.score = 0
+
+        # Positions visited by the last best_move search
+        self.nodes = 0
+
+    def board(self):
+        """
+        Returns the board as a list of lists, like tictactoe.py boards.
+        """
+        return [self.cells[i * self.n:(i + 1) * self.n] for i in range(self.m)]
+
+    def player(self):
+        """
+        Returns player who has the next turn on the board.
+        """
+        return X if len(self.moves) % 2 == 0 else O
+
+    def actions(self):
+        """
+        Returns set of all possible actions (i, j) available on the board.
+        """
+        if self.terminal():
+            return set()
+        return {divmod(cell, self.n) for cell in range(self.m * self.n) if self.cells[cell] is EMPTY}
+
+    def play(self, action):
+        """
+        Makes move (i, j) for the current player in place.
+        """
+        i, j = action
+        if not (0 <= i < self.m and 0 <= j < self.n):
+            raise Exception("Out of bounds")
+        cell = i * self.n + j
+        if self.cells[cell] is not EMPTY or self.won is not None:
+            raise Exception("Invalid Action")
+
+        mark = self.player()
+        counts, others = self.counts[mark], self.counts[O if mark == X else X]
+        weights = self.weights
+        sign = 1 if mark == X else -1
+        self.cells[cell] = mark
+        self.moves.append(cell)
+        for w in self.cell_windows[cell]:
+            count = counts[w]
+            counts[w] = count + 1
+            if others[w]:
+                # Blocked before, or just blocked: the opponent loses the window
+                if not count:
+                    self.score += sign * weights[others[w]]
+                continue
+            self.score += sign * (weights[count + 1] - weights[count])
+
+            # Only windows through the last move can have just been won
+            if count + 1 == self.k:
+                self.won = mark
+
+    def undo(self):
+        """
+        Takes back the last move.
+        """
+        cell = self.moves.pop()
+        mark = self.cells[cell]
+        counts, others = self.counts[mark], self.counts[O if mark == X else X]
+        weights = self.weights
+        sign = 1 if mark == X else -1
+        self.cells[cell] = EMPTY
+        self.won = None
+        for w in self.cell_windows[cell]:
+            count = counts[w] - 1
+            counts[w] = count
+            if others[w]:
+                if not count:
+                    self.score -= sign * weights[others[w]]
+                continue
+            self.score -= sign * (weights[count + 1] - weights[count])
+
+    def result(self, action):
+        """
+        Returns a new game with move (i, j) made, leaving this one unchanged.
+        """
+        game = Game(self.m, self.n, self.k)
+        for cell in self.moves:
+            game.play(divmod(cell, self.n))
+        game.play(action)
+        return game
+
+    def winner(self):
+        """
+        Returns the winner of the game, if there is one.
+        """
+        return self.won
+
+    def terminal(self):
+        """
+        Returns True if game is over, False otherwise.
+        """
+        return self.won is not None or len(self.moves) == self.m * self.n
+
+    def utility(self):
+        """
+        Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
+        """
+        if self.won == X:
+            return 1
+        elif self.won == O:
+            return -1
+        return 0
+
+    def candidates(self, breadth=None):
+        """
+        Returns the empty cells worth searching: those within two cells of
+        a mark (or the center on an empty board), most promising first,
+        keeping at most breadth of them.
+        """
+        if not self.moves:
+            return [(self.m // 2) * self.n + self.n // 2]
+
+        cells, n = self.cells, self.n
+        near = set()
+        for cell in self.moves:
+            i, j = divmod(cell, n)
+            for r in range(max(0, i - 2), min(self.m, i + 3)):
+                for c in range(max(0, j - 2), min(n, j + 3)):
+                    if cells[r * n + c] is EMPTY:
+                        near.add(r * n + c)
+
+        # A move is as promising as the lines it extends for the player
+        # to move plus the lines it blocks for the opponent
+        mark = self.player()
+        counts, others = self.counts[mark], self.counts[O if mark == X else X]
+        weights, cell_windows = self.weights, self.cell_windows
+        gains = []
+        for cell in near:
+            gain = 0
+            for w in cell_windows[cell]:
+                if not others[w]:
+                    gain += weights[counts[w] + 1]
+                elif not counts[w]:
+                    gain += weights[others[w] + 1]
+            gains.append((gain, cell))
+        gains.sort(reverse=True)
+        return [cell for _, cell in gains[:breadth]]
+
+    def negamax(self, depth, alpha, beta, deadline, breadth=None):
+        """
+        Returns the value of the position for the player to move,
+        searching depth plies and breadth moves per position with
+        alpha-beta pruning.
+        """
+        # Checked at every node: a node on a crowded board costs far more
+        # than reading the clock, so sampling would overrun the budget
+        self.nodes += 1
+        if deadline is not None and time.perf_counter() > deadline:
+            raise Timeout()
+
+        # The previous move won: bad for the player to move, and worse
+        # the sooner it happened
+        if self.won is not None:
+            return -(WIN + depth)
+        if len(self.moves) == self.m * self.n:
+            return 0
+        if depth == 0:
+            return self.score if self.player() == X else -self.score
+
+        value = -math.inf
+        for cell in self.candidates(breadth):
+            self.play(divmod(cell, self.n))
+            try:
+                value = max(value, -self.negamax(depth - 1, -beta, -alpha, deadline, breadth))
+            finally:
+                self.undo()
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+        return value
+
+    def best_move(self, time_limit=1.0, max_depth=None, breadth=12):
+        """
+        Returns the best action (i, j) found by iterative deepening within
+        time_limit seconds (None for no limit), searching at most max_depth
+        plies (None for the rest of the game). Below the root only the
+        breadth most promising moves are searched (None for all of them,
+        which makes the search exact given the depth).
+        """
+        if self.terminal():
+            return None
+
+        deadline = None if time_limit is None else time.perf_counter() + time_limit
+        max_depth = self.m * self.n - len(self.moves) if max_depth is None else max_depth
+        self.nodes = 0
+        best = None
+        depth = 0
+
+        while depth < max_depth:
+            depth += 1
+            moves = self.candidates()
+
+            # Search the best move of the previous iteration first
+            if best is not None:
+                moves.remove(best)
+                moves.insert(0, best)
+
+            alpha = -math.inf
+            iteration_best = None
+            try:
+                for cell in moves:
+                    self.play(divmod(cell, self.n))
+                    try:
+                        value = -self.negamax(depth - 1, -math.inf, -alpha, deadline, breadth)
+                    finally:
+                        self.undo()
+                    if value > alpha:
+                        alpha = value
+                        iteration_best = cell
+            except Timeout:
+                break
+
+            # Only a completed iteration replaces the answer
+            best = iteration_best
+            if abs(alpha) >= WIN:
+                break
+
+        if best is None:
+            best = self.candidates()[0]
+        return divmod(best, self.n)
@@ -4,11 +4,51 @@ Tic Tac Toe Player
 
 import math
 import copy
+import mmap
+import os
 
 X = "X"
 O = "O"
 EMPTY = None
 
+# The 8 rotations and reflections of the board, each as the list of
+# (i, j) cells read in order to produce the transformed board
+SYMMETRIES = [
+    [(i, j) for i in range(3) for j in range(3)],
+    [(2 - j, i) for i in range(3) for j in range(3)],
+    [(2 - i, 2 - j) for i in range(3) for j in range(3)],
+    [(j, 2 - i) for i in range(3) for j in range(3)],
+    [(i, 2 - j) for i in range(3) for j in range(3)],
+    [(2 - i, j) for i in range(3) for j in range(3)],
+    [(j, i) for i in range(3) for j in range(3)],
+    [(2 - j, 2 - i) for i in range(3) for j in range(3)]
+]
+
+# Static move ordering for alpha-beta: center, then corners, then edges
+MOVE_ORDER = [(1, 1), (0, 0), (0, 2), (2, 0), (2, 2), (0, 1), (1, 0), (1, 2), (2, 1)]
+
+# Moves that caused a cutoff: the latest one per search depth (killer
+# moves) and a score per move weighted towards shallow cutoffs (history)
+killer_moves = {}
+history = {}
+
+# Number of positions visited by the last alphabeta call
+nodes_searched = 0
+
+# Maps the canonical key of every position searched so far to its minimax
+# value. It is shared by all calls, so the game tree is searched only once
+transposition_table = {}
+
+# Opening book written by book.py: after the header, one byte per board
+# indexed by board_index, holding value + 1 in the high nibble and the
+# best cell + 1 in the low one (0 when the game is over), or NO_ENTRY for
+# boards that cannot be reached in play
+BOOK_VERSION = 1
+BOOK_MAGIC = b"TTTBOOK" + bytes([BOOK_VERSION])
+BOOK_NAME = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tictactoe.book")
+BOOK_SIZE = 3 ** 9
+NO_ENTRY = 0xFF
+
 
 def initial_state():
     """
@@ -130,6 +170,10 @@ def minimax(board):
     
     if terminal(board):
         return None    
+
+    entry = book_entry(board)
+    if entry is not None and entry & 0x0F:
+        return divmod((entry & 0x0F) - 1, 3)
     
     if player(board) == X: 
         return maxvalue(board)[1]
@@ -138,6 +182,36 @@ def minimax(board):
         return minvalue(board)[1]
     
 
+def canonical(board):
+    """
+    Returns a key shared by a board and all its rotations and reflections.
+    """
+    symbols = {X: "X", O: "O", EMPTY: "."}
+    return min(
+        "".join(symbols[board[i][j]] for i, j in symmetry)
+        for symmetry in SYMMETRIES
+    )
+
+
+def board_value(board):
+    """
+    Returns the minimax value of a board, using the transposition table.
+    """
+    key = canonical(board)
+    if key in transposition_table:
+        return transposition_table[key]
+
+    if terminal(board):
+        value = utility(board)
+    elif player(board) == X:
+        value = max(board_value(result(board, action)) for action in actions(board))
+    else:
+        value = min(board_value(result(board, action)) for action in actions(board))
+
+    transposition_table[key] = value
+    return value
+
+
 def maxvalue(board):
     
     if terminal(board):
@@ -146,7 +220,7 @@ def maxvalue(board):
     value = -math.inf
     
     for action in actions(board):
-        temp_value = max(value, minvalue(result(board, action))[0])
+        temp_value = max(value, board_value(result(board, action)))
         if temp_value > value:
             value = temp_value
             best_action = action
@@ -162,9 +236,126 @@ def minvalue(board):
     value = math.inf
     
     for action in actions(board):
-        temp_value = min(value, maxvalue(result(board, action))[0])
+        temp_value = min(value, board_value(result(board, action)))
         if temp_value < value:
             value = temp_value
             best_action = action
     
-    return value, best_action
\ No newline at end of file
+    return value, best_action
+
+
+def alphabeta(board):
+    """
+    Returns an optimal action for the current player on the board, with
+    the same value as the minimax action, found by alpha-beta search with
+    move ordering instead of the transposition table.
+    Sets nodes_searched to the number of positions visited.
+    """
+    global nodes_searched
+    nodes_searched = 0
+
+    if terminal(board):
+        return None
+
+    return alphabeta_value(board, -math.inf, math.inf, 0)[1]
+
+
+def alphabeta_value(board, alpha, beta, depth):
+    """
+    Returns (value, best_action) for board within the (alpha, beta) window.
+    """
+    global nodes_searched
+    nodes_searched += 1
+
+    if terminal(board):
+        return utility(board), None
+
+    maximizing = player(board) == X
+    value = -math.inf if maximizing else math.inf
+    best_action = None
+
+    for action in ordered_actions(board, depth):
+        child_value = alphabeta_value(result(board, action), alpha, beta, depth + 1)[0]
+
+        if (maximizing and child_value > value) or (not maximizing and child_value < value):
+            value = child_value
+            best_action = action
+
+        if maximizing:
+            alpha = max(alpha, value)
+        else:
+            beta = min(beta, value)
+
+        # The opponent will never allow this line: remember the move
+        if alpha >= beta:
+            killer_moves[depth] = action
+            history[action] = history.get(action, 0) + 2 ** (9 - depth)
+            break
+
+    return value, best_action
+
+
+def ordered_actions(board, depth):
+    """
+    Returns the actions of board in search order: the killer move for this
+    depth first, then by history score, then center, corners, edges.
+    """
+    killer = killer_moves.get(depth)
+    return sorted(
+        actions(board),
+        key=lambda action: (action != killer, -history.get(action, 0), MOVE_ORDER.index(action))
+    )
+
+
+def count_nodes(board):
+    """
+    Returns the number of positions a search without pruning visits from
+    board, to compare against nodes_searched.
+    """
+    if terminal(board):
+        return 1
+    return 1 + sum(count_nodes(result(board, action)) for action in actions(board))
+
+
+def board_index(board):
+    """
+    Returns the position of a board in the book: its cells read as
+    base 3 digits, EMPTY 0, X 1 and O 2.
+    """
+    digits = {EMPTY: 0, X: 1, O: 2}
+    index = 0
+    for i in range(3):
+        for j in range(3):
+            index = index * 3 + digits[board[i][j]]
+    return index
+
+
+def load_book(path=BOOK_NAME):
+    """
+    Memory-maps the opening book at path, returning None if it is
+    missing or was written for another layout.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    if len(data) != len(BOOK_MAGIC) + BOOK_SIZE or data[:len(BOOK_MAGIC)] != BOOK_MAGIC:
+        data.close()
+        return None
+    return data
+
+
+def book_entry(board):
+    """
+    Returns the book byte of a board, or None without a book entry.
+    """
+    if book is None:
+        return None
+    entry = book[len(BOOK_MAGIC) + board_index(board)]
+    return None if entry == NO_ENTRY else entry
+
+
+# Loaded once at import, so every move of the game is a single lookup
+book = load_book()